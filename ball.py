@@ -1,21 +1,22 @@
 from turtle import Turtle
 from typing import Tuple, Optional
-import random
-import math
+from engine import BallState, Match
+from trajectory import position_after
+from trail import Trail
 
 
 class Ball(Turtle):
     """
-    A ball class for the Pong game that handles movement, collisions, and effects
+    A ball class for the Pong game that renders a BallState and handles effects
     """
 
     DEFAULT_COLOR = "white"
-    DEFAULT_SPEED = 0.1
-    DEFAULT_MOVE_DISTANCE = (10, 10)
+    DEFAULT_SPEED = BallState.DEFAULT_SPEED
+    DEFAULT_MOVE_DISTANCE = BallState.DEFAULT_MOVE_DISTANCE
     DEFAULT_SIZE = 1.0
-    MIN_SPEED = 0.02
-    SPEED_DECAY = 0.9
-    SPEED_BOOST = 1.1
+    MIN_SPEED = BallState.MIN_SPEED
+    SPEED_DECAY = BallState.SPEED_DECAY
+    SPEED_BOOST = BallState.SPEED_BOOST
 
     def __init__(
             self,
@@ -23,7 +24,8 @@ class Ball(Turtle):
             initial_speed: float = DEFAULT_SPEED,
             move_distance: Tuple[int, int] = DEFAULT_MOVE_DISTANCE,
             size: float = DEFAULT_SIZE,
-            random_start: bool = True
+            random_start: bool = True,
+            state: Optional[BallState] = None
     ):
         """
         Initialize a new ball
@@ -34,20 +36,14 @@ class Ball(Turtle):
             move_distance: (x, y) movement increments (default: (10, 10))
             size: Size multiplier for the ball (default: 1.0)
             random_start: Whether to randomize initial direction (default: True)
+            state: Existing simulation state to render (default: a new BallState)
         """
         super().__init__()
+        self.state = state or BallState(
+            initial_speed, move_distance, random_start, size * BallState.DEFAULT_RADIUS)
         self._setup_ball(color, size)
-        self.x_move, self.y_move = move_distance
-        self.move_speed = initial_speed
-        self.initial_speed = initial_speed
-        self.initial_move_distance = move_distance
-        self.random_start = random_start
-        self.is_active = True
         self.trail_effect = False
-        self._setup_trail()
-
-        if random_start:
-            self._randomize_direction()
+        self.trail: Optional[Trail] = None  # Created the first time the trail is turned on
 
     def _setup_ball(self, color: str, size: float) -> None:
         """Set up the initial ball appearance"""
@@ -55,42 +51,69 @@ class Ball(Turtle):
         self.shape("circle")
         self.shapesize(size, size)
         self.penup()
-        self.goto(0, 0)
+        self.goto(self.state.x, self.state.y)
 
     def _setup_trail(self) -> None:
         """Set up trail effect settings"""
-        self.trail = Turtle()
-        self.trail.hideturtle()
-        self.trail.penup()
-        self.trail.color(self.color()[0])
-
-    def _randomize_direction(self) -> None:
-        """Randomize the ball's initial direction"""
-        angle = random.uniform(-60, 60)  # Increase the range for more angular movement
-        if random.random() < 0.5:
-            angle += 180
-
-        # Convert angle to movement components
-        rad = math.radians(angle)
-        speed = math.sqrt(self.x_move ** 2 + self.y_move ** 2)
-        self.x_move = speed * math.cos(rad)
-        self.y_move = speed * math.sin(rad)
+        if self.trail is None:
+            self.trail = Trail(self.getscreen(), self.color()[0])
 
-    def move(self) -> None:
-        """Move the ball according to current velocity"""
-        if not self.is_active:
-            return
+    @property
+    def x_move(self) -> float:
+        return self.state.x_move
 
-        if self.trail_effect:
-            self.trail.goto(self.pos())
-            self.trail.pendown()
+    @x_move.setter
+    def x_move(self, value: float) -> None:
+        self.state.x_move = value
+
+    @property
+    def y_move(self) -> float:
+        return self.state.y_move
+
+    @y_move.setter
+    def y_move(self, value: float) -> None:
+        self.state.y_move = value
+
+    @property
+    def move_speed(self) -> float:
+        return self.state.move_speed
+
+    @move_speed.setter
+    def move_speed(self, value: float) -> None:
+        self.state.move_speed = value
+
+    @property
+    def is_active(self) -> bool:
+        return self.state.is_active
+
+    def sync(self, alpha: float = 1.0) -> bool:
+        """
+        Move the turtle to the current simulation position
+
+        Args:
+            alpha: Blend between the previous (0.0) and current (1.0) tick
+
+        Returns:
+            True if the ball moved and needs redrawing
+        """
+        if not self.isvisible():
+            return False
+        position = self.state.interpolate(alpha)
+        if self.position() == position:
+            return False
 
-        new_x = self.xcor() + self.x_move
-        new_y = self.ycor() + self.y_move
-        self.goto(new_x, new_y)
+        self.goto(position)
 
         if self.trail_effect:
-            self.trail.penup()
+            self.trail.push(*position)
+        return True
+
+    def move(self) -> None:
+        """Move the ball according to current velocity"""
+        if not self.state.is_active:
+            return
+        self.state.move()
+        self.sync()
 
     def bounce_y(self, speed_boost: bool = False) -> None:
         """
@@ -99,10 +122,7 @@ class Ball(Turtle):
         Args:
             speed_boost: Whether to increase speed after bounce
         """
-        self.y_move *= -1
-        self._add_randomness_to_bounce()
-        if speed_boost:
-            self._boost_speed()
+        self.state.bounce_y(speed_boost)
 
     def bounce_x(self, speed_boost: bool = False) -> None:
         """
@@ -111,40 +131,16 @@ class Ball(Turtle):
         Args:
             speed_boost: Whether to increase speed after bounce
         """
-        self.x_move *= -1
-        self._add_randomness_to_bounce()
-        if speed_boost:
-            self._boost_speed()
-        else:
-            self._decay_speed()
-
-    def _add_randomness_to_bounce(self) -> None:
-        """Add slight randomness to the bounce to avoid straight paths"""
-        angle_variation = random.uniform(-15, 15)  # Increase angle variation for more angular bounces
-        rad = math.radians(angle_variation)
-        new_x_move = self.x_move * math.cos(rad) - self.y_move * math.sin(rad)
-        new_y_move = self.x_move * math.sin(rad) + self.y_move * math.cos(rad)
-        self.x_move = new_x_move
-        self.y_move = new_y_move
+        self.state.bounce_x(speed_boost)
 
     def _boost_speed(self) -> None:
         """Increase ball speed"""
-        self.move_speed *= self.SPEED_BOOST
-
-    def _decay_speed(self) -> None:
-        """Decrease ball speed but not below minimum"""
-        self.move_speed = max(self.MIN_SPEED, self.move_speed * self.SPEED_DECAY)
+        self.state._boost_speed()
 
     def reset_position(self) -> None:
         """Reset ball to center with initial speed"""
-        self.goto(0, 0)
-        self.move_speed = self.initial_speed
-        self.x_move, self.y_move = self.initial_move_distance
-
-        if self.random_start:
-            self._randomize_direction()
-        else:
-            self.bounce_x()
+        self.state.reset_position()
+        self.goto(self.state.x, self.state.y)
 
         if self.trail_effect:
             self.clear_trail()
@@ -152,37 +148,41 @@ class Ball(Turtle):
     def toggle_trail(self) -> None:
         """Toggle trail effect on/off"""
         self.trail_effect = not self.trail_effect
-        if not self.trail_effect:
+        if self.trail_effect:
+            self._setup_trail()
+        else:
             self.clear_trail()
 
     def clear_trail(self) -> None:
         """Clear the trail effect"""
-        self.trail.clear()
+        if self.trail is not None:
+            self.trail.clear()
 
     def pause(self) -> None:
         """Pause ball movement"""
-        self.is_active = False
+        self.state.is_active = False
 
     def resume(self) -> None:
         """Resume ball movement"""
-        self.is_active = True
+        self.state.is_active = True
 
     def get_velocity(self) -> Tuple[float, float]:
         """Get current velocity components"""
-        return (self.x_move, self.y_move)
+        return self.state.get_velocity()
 
     def get_speed(self) -> float:
         """Get current speed"""
-        return math.sqrt(self.x_move ** 2 + self.y_move ** 2)
+        return self.state.get_speed()
 
     def set_color(self, color: str) -> None:
         """Set ball and trail color"""
         self.color(color)
-        self.trail.color(color)
+        if self.trail is not None:
+            self.trail.set_color(color)
 
     def predict_path(self, steps: int = 10) -> list[Tuple[float, float]]:
         """
-        Predict future ball positions
+        Predict future ball positions, reflecting off the top and bottom walls
 
         Args:
             steps: Number of future positions to predict
@@ -190,13 +190,21 @@ class Ball(Turtle):
         Returns:
             List of predicted (x, y) positions
         """
-        positions = []
-        x, y = self.xcor(), self.ycor()
-        dx, dy = self.x_move, self.y_move
+        state = self.state
+        return [
+            position_after(state.x, state.y, state.x_move, state.y_move, step,
+                           Match.LOWER_BOUNDARY, Match.UPPER_BOUNDARY)
+            for step in range(1, steps + 1)
+        ]
+
+    def predict_intercept(self, target_x: float) -> Optional[float]:
+        """
+        Predict the y at which the ball will reach target_x in O(1)
 
-        for _ in range(steps):
-            x += dx
-            y += dy
-            positions.append((x, y))
+        Args:
+            target_x: x of the vertical line, e.g. a paddle face
 
-        return positions
+        Returns:
+            Predicted y, or None if the ball is moving away from target_x
+        """
+        return self.state.predict_intercept(target_x, Match.LOWER_BOUNDARY, Match.UPPER_BOUNDARY)
@@ -0,0 +1,206 @@
+from typing import Optional
+import numpy as np
+from engine import BallState, PaddleState, ScoreState, Match
+from fixed import ANGLE_STEPS, COS_TABLE, FULL_TURN, ONE, SIN_TABLE
+
+# The fixed-point angle tables as floats. np.sin and np.cos results depend
+# on the platform's vector math library; table lookups do not, and are cheaper.
+SIN = np.array(SIN_TABLE, dtype=float) / ONE
+COS = np.array(COS_TABLE, dtype=float) / ONE
+
+
+class BatchMatch:
+    """
+    Many headless matches advanced together with NumPy, using the Match rules
+    """
+
+    def __init__(
+            self,
+            n: int,
+            winning_score: int = ScoreState.DEFAULT_WINNING_SCORE,
+            seed: Optional[int] = None
+    ):
+        """
+        Initialize a batch of matches
+
+        Args:
+            n: Number of concurrent matches
+            winning_score: Points needed to win each match (default: 11)
+            seed: Seed for the batch random generator (default: None)
+        """
+        self.n = n
+        self.winning_score = winning_score
+        self.rng = np.random.default_rng(seed)
+        self.initial_speed = BallState.DEFAULT_SPEED
+        self.launch_speed = float(np.hypot(*BallState.DEFAULT_MOVE_DISTANCE))
+
+        self.ball_x = np.zeros(n)
+        self.ball_y = np.zeros(n)
+        self.x_move = np.zeros(n)
+        self.y_move = np.zeros(n)
+        self.move_speed = np.full(n, self.initial_speed)
+        self.l_y = np.zeros(n)
+        self.r_y = np.zeros(n)
+        self.l_dir = np.zeros(n, dtype=np.int8)  # -1, 0 or 1 per match
+        self.r_dir = np.zeros(n, dtype=np.int8)
+        self.paddle_half_height = np.full(n, PaddleState.DEFAULT_SIZE[0] * 10.0)
+        self.paddle_half_width = PaddleState.DEFAULT_SIZE[1] * 10.0
+        self.radius = float(BallState.DEFAULT_RADIUS)
+        self.l_score = np.zeros(n, dtype=np.int32)
+        self.r_score = np.zeros(n, dtype=np.int32)
+        self.active = np.ones(n, dtype=bool)
+        self.tick = 0
+
+        self._randomize_direction(np.ones(n, dtype=bool))
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> None:
+        """Reset scores, paddles and balls of the selected (default: all) matches"""
+        if mask is None:
+            mask = np.ones(self.n, dtype=bool)
+        self.l_score[mask] = 0
+        self.r_score[mask] = 0
+        self.l_y[mask] = 0.0
+        self.r_y[mask] = 0.0
+        self.active[mask] = True
+        self._reset_ball(mask)
+
+    def _reset_ball(self, mask: np.ndarray) -> None:
+        """Return the selected balls to the centre with initial speed"""
+        self.ball_x[mask] = 0.0
+        self.ball_y[mask] = 0.0
+        self.move_speed[mask] = self.initial_speed
+        self._randomize_direction(mask)
+
+    def _randomize_direction(self, mask: np.ndarray) -> None:
+        """Vector form of BallState._randomize_direction"""
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return
+        angle = self.rng.uniform(-60.0, 60.0, count)
+        angle += np.where(self.rng.random(count) < 0.5, 180.0, 0.0)
+        steps = self._angle_steps(angle)
+        self.x_move[mask] = self.launch_speed * COS[steps]
+        self.y_move[mask] = self.launch_speed * SIN[steps]
+
+    @staticmethod
+    def _angle_steps(degrees: np.ndarray) -> np.ndarray:
+        """Nearest angle table index for each angle, as fixed.angle_step"""
+        return np.rint(degrees * ANGLE_STEPS).astype(np.int64) % FULL_TURN
+
+    def _add_randomness_to_bounce(self, mask: np.ndarray) -> None:
+        """Vector form of BallState._add_randomness_to_bounce"""
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return
+        spread = BallState.BOUNCE_SPREAD
+        steps = self._angle_steps(self.rng.uniform(-spread, spread, count))
+        cos, sin = COS[steps], SIN[steps]
+        x_move, y_move = self.x_move[mask], self.y_move[mask]
+        self.x_move[mask] = x_move * cos - y_move * sin
+        self.y_move[mask] = x_move * sin + y_move * cos
+
+    def _sweep_paddles(
+            self,
+            x: np.ndarray,
+            y: np.ndarray,
+            paddle_x: np.ndarray,
+            paddle_y: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vector form of collision.sweep_aabb against each match's paddle
+
+        Returns:
+            (hit mask, time of impact as a fraction of the tick)
+        """
+        dx, dy = self.ball_x - x, self.ball_y - y
+        half_w = self.paddle_half_width + self.radius
+        half_h = self.paddle_half_height + self.radius
+        with np.errstate(divide="ignore", invalid="ignore"):
+            tx1 = (paddle_x - half_w - x) / dx
+            tx2 = (paddle_x + half_w - x) / dx
+            ty1 = (paddle_y - half_h - y) / dy
+            ty2 = (paddle_y + half_h - y) / dy
+        # A zero displacement on an axis leaves that slab always or never entered
+        inside_x = np.abs(x - paddle_x) <= half_w
+        inside_y = np.abs(y - paddle_y) <= half_h
+        near_x = np.where(dx == 0, np.where(inside_x, -np.inf, np.inf), np.minimum(tx1, tx2))
+        far_x = np.where(dx == 0, np.where(inside_x, np.inf, -np.inf), np.maximum(tx1, tx2))
+        near_y = np.where(dy == 0, np.where(inside_y, -np.inf, np.inf), np.minimum(ty1, ty2))
+        far_y = np.where(dy == 0, np.where(inside_y, np.inf, -np.inf), np.maximum(ty1, ty2))
+        t_enter = np.maximum(near_x, near_y)
+        t_exit = np.minimum(np.minimum(far_x, far_y), 1.0)
+        hit = (t_enter > 0.0) & (t_enter <= t_exit)
+        return hit, t_enter
+
+    def step(self, dt: Optional[float] = None) -> np.ndarray:
+        """
+        Advance every active match by one tick
+
+        Args:
+            dt: Tick length in seconds, as in Match.step (default: None)
+
+        Returns:
+            int8 array per match: 1 if left scored, -1 if right scored, else 0
+        """
+        self.tick += 1
+        live = self.active
+        if dt is None:
+            scale = live.astype(float)
+            paddle_scale = scale
+        else:
+            scale = np.where(live, dt / self.move_speed, 0.0)
+            paddle_scale = np.where(live, dt / Match.PADDLE_STEP_TIME, 0.0)
+
+        # Paddles
+        step = PaddleState.DEFAULT_MOVE_INCREMENT * paddle_scale
+        np.clip(self.l_y + self.l_dir * step, PaddleState.LOWER_BOUNDARY,
+                PaddleState.UPPER_BOUNDARY, out=self.l_y)
+        np.clip(self.r_y + self.r_dir * step, PaddleState.LOWER_BOUNDARY,
+                PaddleState.UPPER_BOUNDARY, out=self.r_y)
+
+        # Ball
+        prev_x, prev_y = self.ball_x.copy(), self.ball_y.copy()
+        self.ball_x += self.x_move * scale
+        self.ball_y += self.y_move * scale
+
+        # Paddle collisions, swept as in Match._collide_paddle
+        to_right = self.x_move > 0
+        paddle_x = np.where(to_right, Match.R_PADDLE_POSITION[0], Match.L_PADDLE_POSITION[0])
+        paddle_y = np.where(to_right, self.r_y, self.l_y)
+        hit, t = self._sweep_paddles(prev_x, prev_y, paddle_x, paddle_y)
+        hit &= live & (self.x_move != 0)
+        if hit.any():
+            self.ball_x[hit] = prev_x[hit] + (self.ball_x[hit] - prev_x[hit]) * t[hit]
+            self.ball_y[hit] = prev_y[hit] + (self.ball_y[hit] - prev_y[hit]) * t[hit]
+            self.x_move[hit] *= -1
+            self._add_randomness_to_bounce(hit)
+            self.move_speed[hit] = np.maximum(
+                BallState.MIN_SPEED, self.move_speed[hit] * BallState.SPEED_DECAY)
+            rest = (1.0 - t[hit]) * (1.0 if dt is None else dt / self.move_speed[hit])
+            self.ball_x[hit] += self.x_move[hit] * rest
+            self.ball_y[hit] += self.y_move[hit] * rest
+
+        # Boundary collisions
+        wall = live & (((self.ball_y > Match.UPPER_BOUNDARY) & (self.y_move > 0)) |
+                       ((self.ball_y < Match.LOWER_BOUNDARY) & (self.y_move < 0)))
+        if wall.any():
+            self.y_move[wall] *= -1
+            self._add_randomness_to_bounce(wall)
+
+        # Scoring
+        left_scored = live & (self.ball_x > Match.RIGHT_BOUNDARY)
+        right_scored = live & (self.ball_x < Match.LEFT_BOUNDARY)
+        scored = left_scored | right_scored
+        result = left_scored.astype(np.int8) - right_scored.astype(np.int8)
+        if scored.any():
+            self._reset_ball(scored)
+            self.l_score += left_scored
+            self.r_score += right_scored
+            finished = scored & (np.maximum(self.l_score, self.r_score) >= self.winning_score)
+            self.active &= ~finished
+        return result
+
+    def run(self, ticks: int, dt: Optional[float] = None) -> None:
+        """Step the batch a fixed number of ticks"""
+        for _ in range(ticks):
+            self.step(dt)
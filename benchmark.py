@@ -0,0 +1,292 @@
+from typing import Callable, Dict, List, Optional
+from engine import Match
+from controllers import CPUController
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+
+DT = 1 / 120
+DEFAULT_TICKS = 200_000
+DEFAULT_FRAMES = 2_000
+
+
+def percentiles(samples_ns: List[int]) -> Dict[str, float]:
+    """p50/p95/p99/max of timing samples, in microseconds"""
+    if not samples_ns:
+        return {}
+    ordered = sorted(samples_ns)
+    last = len(ordered) - 1
+
+    def at(fraction: float) -> float:
+        return round(ordered[int(last * fraction)] / 1000, 3)
+
+    return {"p50_us": at(0.50), "p95_us": at(0.95), "p99_us": at(0.99), "max_us": at(1.0)}
+
+
+def scripted_match(seed: int) -> tuple[Match, List[CPUController]]:
+    """A seeded match with CPU players on both sides"""
+    match = Match(seed=seed)
+    players = [
+        CPUController(match.l_paddle, "default", rng=match.rng, budget_us=10 ** 6),
+        CPUController(match.r_paddle, "hard", rng=match.rng, budget_us=10 ** 6),
+    ]
+    return match, players
+
+
+def _restart_if_over(match: Match) -> None:
+    if not match.score.game_active:
+        match.reset(match.seed + 1)
+
+
+def bench_throughput(ticks: int, seed: int) -> Dict[str, float]:
+    """Uninstrumented ticks per second for a full scripted match step"""
+    match, players = scripted_match(seed)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for player in players:
+            player.tick(match)
+        match.step(DT)
+        _restart_if_over(match)
+    elapsed = time.perf_counter() - start
+    return {"ticks": ticks, "seconds": round(elapsed, 4), "ticks_per_second": round(ticks / elapsed)}
+
+
+def bench_phases(ticks: int, seed: int) -> Dict[str, Dict[str, float]]:
+    """Per-tick time of each phase of Match.step, plus the controllers"""
+    match, players = scripted_match(seed)
+    clock = time.perf_counter_ns
+    samples: Dict[str, List[int]] = {"controllers": [], "move": [], "collide": [], "score": []}
+    controllers = samples["controllers"]
+    phase_start = 0
+
+    def end_phase(name: str) -> None:
+        nonlocal phase_start
+        now = clock()
+        samples[name].append(now - phase_start)
+        phase_start = now
+
+    for _ in range(ticks):
+        t0 = clock()
+        for player in players:
+            player.tick(match)
+        phase_start = clock()
+        controllers.append(phase_start - t0)
+        match.step(DT, end_phase)
+        _restart_if_over(match)
+    return {name: percentiles(values) for name, values in samples.items()}
+
+
+def bench_allocations(ticks: int, seed: int) -> Dict[str, float]:
+    """Memory blocks allocated and retained while stepping"""
+    match, players = scripted_match(seed)
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(ticks):
+        for player in players:
+            player.tick(match)
+        match.step(DT)
+        _restart_if_over(match)
+    blocks_after = sys.getallocatedblocks()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "ticks": ticks,
+        "retained_blocks": blocks_after - blocks_before,
+        "traced_bytes": current,
+        "peak_traced_bytes": peak,
+    }
+
+
+def bench_batch(ticks: int, seed: int, matches: int = 4096) -> Dict[str, object]:
+    """Match-ticks per second for the NumPy batch simulator, if NumPy is installed"""
+    try:
+        from batch import BatchMatch
+    except ImportError as error:
+        return {"skipped": str(error)}
+    batch = BatchMatch(matches, seed=seed)
+    steps = max(1, ticks // matches)
+    start = time.perf_counter()
+    batch.run(steps, DT)
+    elapsed = time.perf_counter() - start
+    return {
+        "matches": matches,
+        "steps": steps,
+        "match_ticks_per_second": round(matches * steps / elapsed),
+    }
+
+
+def bench_env(steps: int, seed: int, envs: int = 1024) -> Dict[str, object]:
+    """Environment steps per second for PongEnv and VectorPongEnv, if NumPy is installed"""
+    try:
+        import numpy as np
+        from env import PongEnv, VectorPongEnv
+    except ImportError as error:
+        return {"skipped": str(error)}
+    single = PongEnv(seed=seed)
+    single.reset(seed)
+    start = time.perf_counter()
+    for i in range(steps):
+        if single.step(i % PongEnv.N_ACTIONS)[2]:
+            single.reset()
+    single_elapsed = time.perf_counter() - start
+
+    vector = VectorPongEnv(envs, seed=seed)
+    vector.reset()
+    actions = np.arange(envs) % VectorPongEnv.N_ACTIONS
+    vector_steps = max(1, steps * 10 // envs)
+    start = time.perf_counter()
+    for _ in range(vector_steps):
+        vector.step(actions)
+    vector_elapsed = time.perf_counter() - start
+    return {
+        "frame_skip": single.frame_skip,
+        "steps_per_second": round(steps / single_elapsed),
+        "vector_envs": envs,
+        "vector_steps_per_second": round(envs * vector_steps / vector_elapsed),
+    }
+
+
+def _start_virtual_display() -> Optional[subprocess.Popen]:
+    """Start Xvfb on a spare display number when no display is available"""
+    if os.environ.get("DISPLAY") or not shutil.which("Xvfb"):
+        return None
+    display = ":97"
+    server = subprocess.Popen(["Xvfb", display, "-screen", "0", "1024x768x24"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(0.5)
+    os.environ["DISPLAY"] = display
+    return server
+
+
+def bench_render(frames: int, seed: int) -> Dict[str, object]:
+    """Frame time of physics, scoreboard and render pass, with a full screen.update for comparison"""
+    server = _start_virtual_display()
+    if not os.environ.get("DISPLAY"):
+        return {"skipped": "no display and Xvfb is not installed"}
+    try:
+        from turtle import Screen
+        from ball import Ball
+        from paddle import Paddle
+        from scoreboard import Scoreboard
+        from renderer import Renderer
+
+        screen = Screen()
+        screen.setup(width=Match.SCREEN_WIDTH, height=Match.SCREEN_HEIGHT)
+        screen.bgcolor("black")
+        screen.tracer(0)
+        match, players = scripted_match(seed)
+        ball = Ball(state=match.ball)
+        scoreboard = Scoreboard(state=match.score)
+        r_paddle = Paddle(Match.R_PADDLE_POSITION, state=match.r_paddle)
+        l_paddle = Paddle(Match.L_PADDLE_POSITION, state=match.l_paddle)
+        renderer = Renderer(screen)
+        renderer.add(ball, r_paddle, l_paddle)
+
+        clock = time.perf_counter_ns
+        samples: Dict[str, List[int]] = {"physics": [], "scoreboard": [], "render": [],
+                                         "screen_update": [], "frame": []}
+        ticks_per_frame = 2  # 120 Hz physics under 60 Hz rendering
+
+        def advance() -> None:
+            for _ in range(ticks_per_frame):
+                for player in players:
+                    player.tick(match)
+                match.step(DT)
+                _restart_if_over(match)
+
+        # The render pass alone, so it has to draw every sprite by itself
+        for _ in range(frames):
+            t0 = clock()
+            advance()
+            t1 = clock()
+            scoreboard.update_scoreboard()
+            t2 = clock()
+            renderer.render()
+            t3 = clock()
+            samples["physics"].append(t1 - t0)
+            samples["scoreboard"].append(t2 - t1)
+            samples["render"].append(t3 - t2)
+            samples["frame"].append(t3 - t0)
+        # A full screen.update() per frame instead, for comparison
+        for _ in range(frames):
+            advance()
+            for sprite in (ball, r_paddle, l_paddle):
+                sprite.sync()
+            t0 = clock()
+            screen.update()
+            samples["screen_update"].append(clock() - t0)
+        screen.bye()
+        return {"frames": frames, **{name: percentiles(values) for name, values in samples.items()}}
+    finally:
+        if server is not None:
+            server.terminate()
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old: dict, new: dict) -> None:
+    """Print the relative change of every shared numeric result"""
+    def walk(a: object, b: object, path: str) -> None:
+        if isinstance(a, dict) and isinstance(b, dict):
+            for key in a.keys() & b.keys():
+                walk(a[key], b[key], f"{path}.{key}" if path else key)
+        elif isinstance(a, (int, float)) and isinstance(b, (int, float)) and a:
+            print(f"{path}: {a} -> {b} ({(b - a) / a:+.1%})")
+
+    walk(old["results"], new["results"], "")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Pong physics and rendering")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="physics ticks per benchmark")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="frames for the render benchmark")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-render", action="store_true", help="skip the render benchmark")
+    parser.add_argument("--output", default="bench_results.json", help="where to save the JSON results")
+    parser.add_argument("--compare", metavar="JSON", help="earlier results to compare against")
+    args = parser.parse_args()
+
+    benchmarks: Dict[str, Callable[[], dict]] = {
+        "throughput": lambda: bench_throughput(args.ticks, args.seed),
+        "phases": lambda: bench_phases(args.ticks, args.seed),
+        "allocations": lambda: bench_allocations(min(args.ticks, 50_000), args.seed),
+        "batch": lambda: bench_batch(args.ticks * 10, args.seed),
+        "env": lambda: bench_env(args.ticks // 4, args.seed),
+    }
+    if not args.no_render:
+        benchmarks["render"] = lambda: bench_render(args.frames, args.seed)
+
+    results = {}
+    for name, run in benchmarks.items():
+        results[name] = run()
+        print(f"{name}: {json.dumps(results[name])}")
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Saved results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+from typing import Dict, Iterator, List, Tuple, Optional
+import math
+
+Edges = Tuple[float, float, float, float]  # (left, right, top, bottom), as from Paddle.get_edges
+
+
+def sweep_aabb(
+        x: float,
+        y: float,
+        dx: float,
+        dy: float,
+        edges: Edges,
+        radius: float = 0.0
+) -> Optional[Tuple[float, int, int]]:
+    """
+    Find when a moving ball first touches a box during one tick
+
+    The box is grown by the ball radius so the ball can be swept as a point
+    from (x, y) to (x + dx, y + dy). A ball already overlapping the box at
+    the start of the tick is not reported, so it can leave after a bounce.
+
+    Args:
+        x: Ball centre x at the start of the tick
+        y: Ball centre y at the start of the tick
+        dx: Ball x displacement over the tick
+        dy: Ball y displacement over the tick
+        edges: (left, right, top, bottom) of the box
+        radius: Ball radius (default: 0.0)
+
+    Returns:
+        (t, normal_x, normal_y) with t in [0, 1] as the fraction of the tick
+        at impact and the normal of the face that was hit, or None
+    """
+    left, right, top, bottom = edges
+    left -= radius
+    right += radius
+    top += radius
+    bottom -= radius
+
+    t_enter, t_exit = 0.0, 1.0
+    normal_x = normal_y = 0
+
+    if dx == 0:
+        if x < left or x > right:
+            return None
+    else:
+        near, far = (left - x) / dx, (right - x) / dx
+        if near > far:
+            near, far = far, near
+        if near > t_enter:
+            t_enter = near
+            normal_x = -1 if dx > 0 else 1
+        t_exit = min(t_exit, far)
+        if t_enter > t_exit:
+            return None
+
+    if dy == 0:
+        if y < bottom or y > top:
+            return None
+    else:
+        near, far = (bottom - y) / dy, (top - y) / dy
+        if near > far:
+            near, far = far, near
+        if near > t_enter:
+            t_enter = near
+            normal_x = 0
+            normal_y = -1 if dy > 0 else 1
+        t_exit = min(t_exit, far)
+        if t_enter > t_exit:
+            return None
+
+    if normal_x == 0 and normal_y == 0:
+        return None  # Overlapping from the start of the tick
+    return t_enter, normal_x, normal_y
+
+
+def sweep_bounds(x: float, y: float, dx: float, dy: float, radius: float = 0.0) -> Edges:
+    """Edges of the box covering a ball's whole path over one tick"""
+    return (
+        min(x, x + dx) - radius,
+        max(x, x + dx) + radius,
+        max(y, y + dy) + radius,
+        min(y, y + dy) - radius
+    )
+
+
+class UniformGrid:
+    """
+    Uniform-grid broadphase
+
+    Every item is bucketed into each square cell its box overlaps, so a
+    query only looks at items in nearby cells and the number of candidate
+    pairs grows with crowding rather than with the square of the item
+    count. Results come back in insertion order, so simulations using the
+    grid stay deterministic.
+    """
+
+    DEFAULT_CELL_SIZE = 64
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        """
+        Initialize an empty grid
+
+        Args:
+            cell_size: Width and height of a cell in pixels (default: 64)
+        """
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List] = {}
+        self.count = 0
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.count = 0
+
+    def _keys(self, edges: Edges) -> Iterator[Tuple[int, int]]:
+        left, right, top, bottom = edges
+        size = self.cell_size
+        for cx in range(math.floor(left / size), math.floor(right / size) + 1):
+            for cy in range(math.floor(bottom / size), math.floor(top / size) + 1):
+                yield cx, cy
+
+    def insert(self, item, edges: Edges) -> None:
+        """Add an item covering the box (left, right, top, bottom)"""
+        cells = self.cells
+        for key in self._keys(edges):
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [item]
+            else:
+                bucket.append(item)
+        self.count += 1
+
+    def query(self, edges: Edges) -> List:
+        """Items sharing at least one cell with the box, each listed once"""
+        if not self.count:
+            return []
+        found = {}
+        cells = self.cells
+        for key in self._keys(edges):
+            bucket = cells.get(key)
+            if bucket:
+                for item in bucket:
+                    found[id(item)] = item
+        return list(found.values())
+
+    def pairs(self) -> List[Tuple[object, object]]:
+        """Pairs of items sharing at least one cell, each pair listed once"""
+        found = {}
+        for bucket in self.cells.values():
+            for i in range(len(bucket) - 1):
+                first = bucket[i]
+                for second in bucket[i + 1:]:
+                    found[(id(first), id(second))] = (first, second)
+        return list(found.values())
@@ -0,0 +1,155 @@
+from typing import Callable, Optional
+from engine import Match, PaddleState
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class PaddleController:
+    """
+    Drives a paddle through start_move/stop_move once per physics tick
+
+    Subclasses implement control(). tick() times each call against a fixed
+    budget; a controller that overruns skips its next decisions and keeps
+    its last movement, so on average it never costs more than the budget.
+    """
+
+    DEFAULT_BUDGET_US = 500
+
+    def __init__(
+            self,
+            paddle: PaddleState,
+            budget_us: int = DEFAULT_BUDGET_US,
+            on_overrun: Optional[Callable[["PaddleController", int], None]] = None
+    ):
+        """
+        Initialize a new controller
+
+        Args:
+            paddle: Paddle state to drive
+            budget_us: Time allowed per tick in microseconds (default: 500)
+            on_overrun: Called with (controller, elapsed_us) after an overrun
+        """
+        self.paddle = paddle
+        self.budget_ns = budget_us * 1000
+        self.on_overrun = on_overrun or self._log_overrun
+        self.overruns = 0
+        self.last_elapsed_us = 0
+        self._skip_ticks = 0
+
+    def tick(self, match: Match) -> None:
+        """Run control() for this tick unless paying off an earlier overrun"""
+        if self._skip_ticks:
+            self._skip_ticks -= 1
+            return
+        start = time.perf_counter_ns()
+        self.control(match)
+        elapsed = time.perf_counter_ns() - start
+        self.last_elapsed_us = elapsed // 1000
+        if elapsed > self.budget_ns:
+            self.overruns += 1
+            self._skip_ticks = elapsed // self.budget_ns
+            self.on_overrun(self, self.last_elapsed_us)
+
+    def control(self, match: Match) -> None:
+        """Decide this tick's movement by calling start_move or stop_move"""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Forget per-match state, e.g. an owed overrun, when the match restarts"""
+        self._skip_ticks = 0
+        self.last_elapsed_us = 0
+
+    def move_towards(self, target_y: float, dead_zone: float) -> None:
+        """Start moving the paddle towards target_y, or stop within dead_zone"""
+        offset = target_y - self.paddle.y
+        if offset > dead_zone:
+            self.paddle.start_move(1)
+        elif offset < -dead_zone:
+            self.paddle.start_move(-1)
+        else:
+            self.paddle.stop_move()
+
+    @staticmethod
+    def _log_overrun(controller: "PaddleController", elapsed_us: int) -> None:
+        logger.warning(
+            "%s took %dus, over its %dus budget",
+            type(controller).__name__, elapsed_us, controller.budget_ns // 1000
+        )
+
+
+class CPUController(PaddleController):
+    """
+    Computer opponent with selectable difficulty
+    """
+
+    # level: (ticks between decisions, aim error in px, uses trajectory prediction)
+    LEVELS = {
+        "easy": (12, 45, False),
+        "default": (6, 20, True),
+        "hard": (2, 6, True),
+    }
+    DEAD_ZONE = 8
+
+    def __init__(
+            self,
+            paddle: PaddleState,
+            level: str = "default",
+            rng: Optional[random.Random] = None,
+            **kwargs
+    ):
+        """
+        Initialize a new CPU opponent
+
+        Args:
+            paddle: Paddle state to drive
+            level: One of LEVELS (default: "default")
+            rng: Random source for aiming errors (default: the random module)
+            **kwargs: Passed on to PaddleController
+        """
+        super().__init__(paddle, **kwargs)
+        self.rng = rng or random
+        self.set_level(level)
+        self._ticks_until_decision = 0
+        self._aim_offset = 0.0
+        self._aimed_bounce = -1
+
+    def reset(self) -> None:
+        super().reset()
+        self._ticks_until_decision = 0
+        self._aim_offset = 0.0
+        self._aimed_bounce = -1
+
+    def set_level(self, level: str) -> None:
+        """Switch difficulty; unknown levels fall back to "default" """
+        self.level = level if level in self.LEVELS else "default"
+        self.reaction_ticks, self.aim_error, self.predicts = self.LEVELS[self.level]
+
+    def control(self, match: Match) -> None:
+        if self._ticks_until_decision > 0:
+            self._ticks_until_decision -= 1
+            return
+        self._ticks_until_decision = self.reaction_ticks - 1
+
+        ball = match.ball
+        paddle = self.paddle
+        approaching = (ball.x_move > 0) == (paddle.x > ball.x)
+        if not approaching:
+            self.move_towards(0.0, self.DEAD_ZONE)  # Drift back to the middle
+            return
+
+        # Pick a fresh aiming error once per straight-line segment
+        if ball.bounces != self._aimed_bounce:
+            self._aimed_bounce = ball.bounces
+            self._aim_offset = self.rng.uniform(-self.aim_error, self.aim_error)
+
+        target_y = ball.y
+        if self.predicts:
+            left, right, _, _ = paddle.get_edges()
+            face_x = left - ball.radius if paddle.x > 0 else right + ball.radius
+            predicted = match.predict_intercept(face_x)
+            if predicted is not None:
+                target_y = predicted
+        self.move_towards(target_y + self._aim_offset, self.DEAD_ZONE)
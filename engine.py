@@ -0,0 +1,671 @@
+from typing import Callable, List, Tuple, Optional
+from collision import UniformGrid, sweep_aabb, sweep_bounds
+from trajectory import intercept_y
+import random
+import math
+
+
+class BallState:
+    """
+    Display-free ball state: position, velocity and speed for one match
+    """
+
+    __slots__ = (
+        "x", "y", "prev_x", "prev_y", "x_move", "y_move", "move_speed",
+        "initial_speed", "initial_move_distance", "random_start", "is_active",
+        "radius", "bounces", "rng", "_prediction",
+        "min_speed", "speed_decay", "bounce_spread"
+    )
+
+    DEFAULT_SPEED = 0.1
+    DEFAULT_MOVE_DISTANCE = (10, 10)
+    MIN_SPEED = 0.02
+    SPEED_DECAY = 0.9
+    SPEED_BOOST = 1.1
+    BOUNCE_SPREAD = 15  # Degrees of random turn added to every bounce, either way
+    DEFAULT_RADIUS = 10  # Half of the default 20px turtle circle
+
+    def __init__(
+            self,
+            initial_speed: float = DEFAULT_SPEED,
+            move_distance: Tuple[int, int] = DEFAULT_MOVE_DISTANCE,
+            random_start: bool = True,
+            radius: float = DEFAULT_RADIUS,
+            rng: Optional[random.Random] = None
+    ):
+        """
+        Initialize a new ball state
+
+        Args:
+            initial_speed: Starting movement speed (default: 0.1)
+            move_distance: (x, y) movement increments (default: (10, 10))
+            random_start: Whether to randomize initial direction (default: True)
+            radius: Collision radius in pixels (default: 10)
+            rng: Random source for serve and bounce angles (default: the random module)
+        """
+        self.x = self.prev_x = 0.0
+        self.y = self.prev_y = 0.0
+        self.x_move, self.y_move = move_distance
+        self.move_speed = initial_speed
+        self.initial_speed = initial_speed
+        self.initial_move_distance = move_distance
+        self.random_start = random_start
+        self.is_active = True
+        self.radius = radius
+        self.rng = rng or random
+        self.bounces = 0  # Bumped whenever the straight-line path changes
+        self._prediction = None
+        # Per-ball copies of the tuning constants, so tools can vary them per match
+        self.min_speed = self.MIN_SPEED
+        self.speed_decay = self.SPEED_DECAY
+        self.bounce_spread = self.BOUNCE_SPREAD
+
+        if random_start:
+            self._randomize_direction()
+
+    def _randomize_direction(self) -> None:
+        """Randomize the ball's initial direction"""
+        angle = self.rng.uniform(-60, 60)  # Increase the range for more angular movement
+        if self.rng.random() < 0.5:
+            angle += 180
+
+        # Convert angle to movement components
+        rad = math.radians(angle)
+        speed = math.sqrt(self.x_move ** 2 + self.y_move ** 2)
+        self.x_move = speed * math.cos(rad)
+        self.y_move = speed * math.sin(rad)
+
+    def move(self, scale: float = 1.0) -> None:
+        """
+        Move the ball according to current velocity
+
+        Args:
+            scale: Fraction of a full x_move/y_move step to travel (default: 1.0)
+        """
+        if not self.is_active:
+            return
+        self.prev_x, self.prev_y = self.x, self.y
+        self.x += self.x_move * scale
+        self.y += self.y_move * scale
+
+    def bounce_y(self, speed_boost: bool = False) -> None:
+        """
+        Bounce the ball vertically
+
+        Args:
+            speed_boost: Whether to increase speed after bounce
+        """
+        self.y_move *= -1
+        self.bounces += 1
+        self._add_randomness_to_bounce()
+        if speed_boost:
+            self._boost_speed()
+
+    def bounce_x(self, speed_boost: bool = False) -> None:
+        """
+        Bounce the ball horizontally
+
+        Args:
+            speed_boost: Whether to increase speed after bounce
+        """
+        self.x_move *= -1
+        self.bounces += 1
+        self._add_randomness_to_bounce()
+        if speed_boost:
+            self._boost_speed()
+        else:
+            self._decay_speed()
+
+    def reflect(self, normal_x: int, normal_y: int) -> None:
+        """
+        Bounce off a surface without changing speed
+
+        Args:
+            normal_x: x of the surface normal (-1, 0 or 1)
+            normal_y: y of the surface normal (-1, 0 or 1)
+        """
+        if normal_x:
+            self.x_move = abs(self.x_move) * normal_x
+        if normal_y:
+            self.y_move = abs(self.y_move) * normal_y
+        self.bounces += 1
+
+    def _add_randomness_to_bounce(self) -> None:
+        """Add slight randomness to the bounce to avoid straight paths"""
+        angle_variation = self.rng.uniform(-self.bounce_spread, self.bounce_spread)  # Increase angle variation for more angular bounces
+        rad = math.radians(angle_variation)
+        new_x_move = self.x_move * math.cos(rad) - self.y_move * math.sin(rad)
+        new_y_move = self.x_move * math.sin(rad) + self.y_move * math.cos(rad)
+        self.x_move = new_x_move
+        self.y_move = new_y_move
+
+    def _boost_speed(self) -> None:
+        """Increase ball speed"""
+        self.move_speed *= self.SPEED_BOOST
+
+    def _decay_speed(self) -> None:
+        """Decrease ball speed but not below minimum"""
+        self.move_speed = max(self.min_speed, self.move_speed * self.speed_decay)
+
+    def reset_position(self) -> None:
+        """Reset ball to center with initial speed"""
+        self.x = self.prev_x = 0.0
+        self.y = self.prev_y = 0.0
+        self.move_speed = self.initial_speed
+        self.x_move, self.y_move = self.initial_move_distance
+        self.bounces += 1
+
+        if self.random_start:
+            self._randomize_direction()
+        else:
+            self.bounce_x()
+
+    def distance(self, x: float, y: float) -> float:
+        """Distance from the ball centre to the point (x, y)"""
+        return math.hypot(self.x - x, self.y - y)
+
+    def predict_intercept(
+            self,
+            target_x: float,
+            lower: float,
+            upper: float
+    ) -> Optional[float]:
+        """
+        Predict where the ball crosses target_x, folding in wall reflections
+
+        Moving along a straight line does not change the answer, so the result
+        is cached until the next bounce or reset.
+
+        Args:
+            target_x: x of the vertical line to cross
+            lower: y of the lower wall the ball centre reflects from
+            upper: y of the upper wall the ball centre reflects from
+
+        Returns:
+            y at the crossing, or None if the ball is moving away from target_x
+        """
+        key = (self.bounces, target_x, lower, upper)
+        cached = self._prediction
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        hit = intercept_y(self.x, self.y, self.x_move, self.y_move, target_x, lower, upper)
+        result = None if hit is None else hit[0]
+        self._prediction = (key, result)
+        return result
+
+    def interpolate(self, alpha: float) -> Tuple[float, float]:
+        """Position between the previous and current tick, for rendering"""
+        return (
+            self.prev_x + (self.x - self.prev_x) * alpha,
+            self.prev_y + (self.y - self.prev_y) * alpha
+        )
+
+    def get_velocity(self) -> Tuple[float, float]:
+        """Get current velocity components"""
+        return (self.x_move, self.y_move)
+
+    def get_speed(self) -> float:
+        """Get current speed"""
+        return math.sqrt(self.x_move ** 2 + self.y_move ** 2)
+
+
+class PaddleState:
+    """
+    Display-free paddle state: position, size and movement intent
+    """
+
+    __slots__ = ("x", "y", "prev_y", "size", "move_increment", "moving", "direction")
+
+    DEFAULT_MOVE_INCREMENT = 20
+    DEFAULT_SIZE = (5, 1)  # (height, width)
+    UPPER_BOUNDARY = 250
+    LOWER_BOUNDARY = -250
+
+    def __init__(
+            self,
+            position: Tuple[int, int],
+            move_increment: int = DEFAULT_MOVE_INCREMENT,
+            size: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Initialize a new paddle state
+
+        Args:
+            position: Initial (x, y) position of the paddle
+            move_increment: Movement speed in pixels (default: 20)
+            size: Optional tuple of (height, width) for paddle size
+        """
+        self.x, self.y = position
+        self.prev_y = self.y
+        self.size = size or self.DEFAULT_SIZE
+        self.move_increment = move_increment
+        self.moving = False  # For smooth continuous movement
+        self.direction = 0  # Current movement direction (-1, 0, or 1)
+
+    def go_up(self, scale: float = 1.0) -> None:
+        """Move the paddle up if within bounds"""
+        if self.y < self.UPPER_BOUNDARY:
+            self.y = min(self.y + self.move_increment * scale, self.UPPER_BOUNDARY)
+
+    def go_down(self, scale: float = 1.0) -> None:
+        """Move the paddle down if within bounds"""
+        if self.y > self.LOWER_BOUNDARY:
+            self.y = max(self.y - self.move_increment * scale, self.LOWER_BOUNDARY)
+
+    def start_move(self, direction: int) -> None:
+        """Start continuous movement in the specified direction"""
+        self.moving = True
+        self.direction = direction
+
+    def stop_move(self) -> None:
+        """Stop continuous movement"""
+        self.moving = False
+        self.direction = 0
+
+    def update(self, scale: float = 1.0) -> None:
+        """
+        Update paddle position for continuous movement
+
+        Args:
+            scale: Fraction of a full move_increment to travel (default: 1.0)
+        """
+        self.prev_y = self.y
+        if self.moving:
+            if self.direction > 0:
+                self.go_up(scale)
+            elif self.direction < 0:
+                self.go_down(scale)
+
+    def interpolate_y(self, alpha: float) -> float:
+        """Height between the previous and current tick, for rendering"""
+        return self.prev_y + (self.y - self.prev_y) * alpha
+
+    def stretch_y(self, factor: float) -> None:
+        """
+        Adjust the paddle height by a factor
+
+        Args:
+            factor: Multiplication factor for paddle height
+        """
+        self.size = (self.size[0] * factor, self.size[1])
+
+    def reset_size(self) -> None:
+        """Reset paddle to default size"""
+        self.size = self.DEFAULT_SIZE
+
+    def get_edges(self) -> Tuple[float, float, float, float]:
+        """
+        Get the coordinates of paddle edges for precise collision detection
+
+        Returns:
+            Tuple of (left, right, top, bottom) edge coordinates
+        """
+        half_width = self.size[1] * 10  # 10 is default turtle size
+        half_height = self.size[0] * 10
+        return (
+            self.x - half_width,
+            self.x + half_width,
+            self.y + half_height,
+            self.y - half_height
+        )
+
+
+class ObstacleState:
+    """
+    Static box that balls bounce off, for obstacle game modes
+    """
+
+    __slots__ = ("x", "y", "half_width", "half_height")
+
+    def __init__(self, position: Tuple[float, float], size: Tuple[float, float]):
+        """
+        Initialize a new obstacle
+
+        Args:
+            position: (x, y) of the obstacle centre
+            size: (width, height) in pixels
+        """
+        self.x, self.y = position
+        self.half_width = size[0] / 2
+        self.half_height = size[1] / 2
+
+    def get_edges(self) -> Tuple[float, float, float, float]:
+        """
+        Get the coordinates of the obstacle edges, as PaddleState.get_edges
+
+        Returns:
+            Tuple of (left, right, top, bottom) edge coordinates
+        """
+        return (
+            self.x - self.half_width,
+            self.x + self.half_width,
+            self.y + self.half_height,
+            self.y - self.half_height
+        )
+
+
+class ScoreState:
+    """
+    Display-free score keeping for one match
+    """
+
+    __slots__ = ("l_score", "r_score", "winning_score", "game_active", "high_score")
+
+    DEFAULT_WINNING_SCORE = 11
+
+    def __init__(self, winning_score: int = DEFAULT_WINNING_SCORE, high_score: int = 0):
+        self.l_score = 0
+        self.r_score = 0
+        self.winning_score = winning_score
+        self.game_active = True
+        self.high_score = high_score
+
+    def l_point(self) -> Optional[str]:
+        """Award a point to the left player and return the winner, if any"""
+        self.l_score += 1
+        return self.check_winner()
+
+    def r_point(self) -> Optional[str]:
+        """Award a point to the right player and return the winner, if any"""
+        self.r_score += 1
+        return self.check_winner()
+
+    def winner(self) -> Optional[str]:
+        """Return "LEFT" or "RIGHT" once a side has reached the winning score"""
+        if max(self.l_score, self.r_score) >= self.winning_score:
+            return "LEFT" if self.l_score > self.r_score else "RIGHT"
+        return None
+
+    def check_winner(self) -> Optional[str]:
+        """End the match and raise the high score once a side has won"""
+        winner = self.winner()
+        if winner is not None:
+            self.game_active = False
+            self.high_score = max(self.high_score, self.l_score, self.r_score)
+        return winner
+
+    def reset_scores(self) -> None:
+        """Reset game state"""
+        self.l_score = 0
+        self.r_score = 0
+        self.game_active = True
+
+    def get_score(self) -> Tuple[int, int]:
+        """Return current scores"""
+        return self.l_score, self.r_score
+
+    def set_winning_score(self, score: int) -> None:
+        """Set custom winning score"""
+        if score > 0:
+            self.winning_score = score
+
+
+class Match:
+    """
+    Headless Pong match applying the same rules as PongGame.game_loop
+    """
+
+    SCREEN_WIDTH = 800
+    SCREEN_HEIGHT = 600
+    R_PADDLE_POSITION = (350, 0)
+    L_PADDLE_POSITION = (-350, 0)
+    UPPER_BOUNDARY = SCREEN_HEIGHT / 2 - 10
+    LOWER_BOUNDARY = -SCREEN_HEIGHT / 2 + 10
+    RIGHT_BOUNDARY = SCREEN_WIDTH / 2
+    LEFT_BOUNDARY = -SCREEN_WIDTH / 2
+    PADDLE_STEP_TIME = 1 / 30  # Seconds per move_increment, roughly the OS key-repeat rate
+
+    def __init__(
+            self,
+            winning_score: int = ScoreState.DEFAULT_WINNING_SCORE,
+            seed: Optional[int] = None
+    ):
+        """
+        Initialize a new match
+
+        Args:
+            winning_score: Points needed to win (default: 11)
+            seed: Seed for this match's random generator; a fresh one is
+                drawn when None so every match can still be replayed
+        """
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+        self.ball = BallState(rng=self.rng)
+        self.balls: List[BallState] = [self.ball]  # The first ball is always self.ball
+        self.r_paddle = PaddleState(self.R_PADDLE_POSITION)
+        self.l_paddle = PaddleState(self.L_PADDLE_POSITION)
+        self.obstacles: List[ObstacleState] = []
+        self.obstacle_grid = UniformGrid()
+        self.ball_grid = UniformGrid()
+        self.score = ScoreState(winning_score)
+        self.tick = 0
+        self.events = None  # Optional events.EventLog told of hits, wall bounces, points and resets
+
+    def add_ball(self, ball: Optional[BallState] = None) -> BallState:
+        """
+        Put an extra ball in play, e.g. for multiball
+
+        Extra balls score like the main one but leave play when they do.
+
+        Args:
+            ball: Ball to add as it is (default: a new ball served from the centre)
+        """
+        if ball is None:
+            ball = BallState(rng=self.rng)
+        self.balls.append(ball)
+        return ball
+
+    def add_obstacle(self, obstacle: ObstacleState) -> None:
+        """Place a static obstacle on the field"""
+        self.obstacles.append(obstacle)
+        self.obstacle_grid.insert(obstacle, obstacle.get_edges())
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """
+        Start a new game in place, reseeding the random generator
+
+        Paddle sizes, obstacles and the winning score are kept; extra balls
+        are removed and everything else returns to the state of a freshly
+        constructed Match with the same seed.
+        """
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng.seed(self.seed)
+        self.score.reset_scores()
+        for paddle, (x, y) in ((self.r_paddle, self.R_PADDLE_POSITION),
+                               (self.l_paddle, self.L_PADDLE_POSITION)):
+            paddle.x, paddle.y = x, y
+            paddle.prev_y = y
+            paddle.stop_move()
+        del self.balls[1:]
+        self.ball.reset_position()
+        self.tick = 0
+        if self.events is not None:
+            self.events.emit("reset", self, self.ball)
+
+    def step(
+            self,
+            dt: Optional[float] = None,
+            on_phase: Optional[Callable[[str], None]] = None
+    ) -> Optional[str]:
+        """
+        Advance the match by one tick
+
+        Args:
+            dt: Tick length in seconds. The ball covers dt / move_speed of a
+                full move per tick, so speed no longer depends on the tick
+                rate. None runs one classic full-size move (default: None)
+            on_phase: Called with "move", "collide" and "score" as each phase
+                ends, for profilers and benchmarks (default: None)
+
+        Returns:
+            "left" or "right" when that side scored this tick, otherwise None
+        """
+        self.tick += 1
+        self.move_objects(dt)
+        if on_phase is not None:
+            on_phase("move")
+        self.collide(dt)
+        if on_phase is not None:
+            on_phase("collide")
+        scorer = self.check_score()
+        if on_phase is not None:
+            on_phase("score")
+        return scorer
+
+    def move_objects(self, dt: Optional[float] = None) -> None:
+        """First phase of step: move the ball and any paddles in motion"""
+        if dt is None:
+            for ball in self.balls:
+                ball.move()
+            self.r_paddle.update()
+            self.l_paddle.update()
+        else:
+            for ball in self.balls:
+                ball.move(dt / ball.move_speed)
+            paddle_scale = dt / self.PADDLE_STEP_TIME
+            self.r_paddle.update(paddle_scale)
+            self.l_paddle.update(paddle_scale)
+
+    def collide(self, dt: Optional[float] = None) -> None:
+        """Second phase of step: paddle, obstacle, wall and ball-to-ball bounces"""
+        for ball in self.balls:
+            # Paddle collisions, swept over the whole tick so fast balls cannot tunnel
+            if ball.x_move > 0:
+                if self._collide_paddle(ball, self.r_paddle, dt) and self.events is not None:
+                    self.events.emit("hit", self, ball, "right")
+            elif ball.x_move < 0:
+                if self._collide_paddle(ball, self.l_paddle, dt) and self.events is not None:
+                    self.events.emit("hit", self, ball, "left")
+            if self.obstacles:
+                self._collide_obstacles(ball)
+
+            # Boundary collisions, only while still heading out so small ticks
+            # cannot bounce the ball twice on the same wall
+            if ((ball.y > self.UPPER_BOUNDARY and ball.y_move > 0) or
+                    (ball.y < self.LOWER_BOUNDARY and ball.y_move < 0)):
+                ball.bounce_y()
+                if self.events is not None:
+                    self.events.emit("wall", self, ball)
+        if len(self.balls) > 1:
+            self._collide_balls()
+
+    def check_score(self) -> Optional[str]:
+        """
+        Last phase of step: award a point for every ball that left the field
+
+        The main ball is re-served; extra balls leave play.
+
+        Returns:
+            "left" or "right" for the first point scored this tick, otherwise None
+        """
+        scorer = None
+        balls = self.balls
+        for index in range(len(balls) - 1, -1, -1):
+            ball = balls[index]
+            if ball.x > self.RIGHT_BOUNDARY:
+                side = "left"
+                self.score.l_point()
+            elif ball.x < self.LEFT_BOUNDARY:
+                side = "right"
+                self.score.r_point()
+            else:
+                continue
+            if self.events is not None:
+                self.events.emit("point", self, ball, side)
+            if index:
+                del balls[index]
+            else:
+                ball.reset_position()
+            scorer = side
+        return scorer
+
+    def predict_intercept(self, target_x: float) -> Optional[float]:
+        """Predict the y at which the ball centre will reach target_x"""
+        return self.ball.predict_intercept(target_x, self.LOWER_BOUNDARY, self.UPPER_BOUNDARY)
+
+    def _collide_paddle(self, ball: BallState, paddle: PaddleState, dt: Optional[float]) -> bool:
+        """
+        Bounce a ball off a paddle it reached during the last move
+
+        The ball is placed at the exact point of impact and then travels the
+        rest of the tick with its new velocity.
+
+        Returns:
+            True if the ball hit the paddle
+        """
+        dx, dy = ball.x - ball.prev_x, ball.y - ball.prev_y
+        hit = sweep_aabb(ball.prev_x, ball.prev_y, dx, dy, paddle.get_edges(), ball.radius)
+        if hit is None:
+            return False
+        t = hit[0]
+        ball.x = ball.prev_x + dx * t
+        ball.y = ball.prev_y + dy * t
+        ball.bounce_x()
+        rest = (1.0 - t) * (1.0 if dt is None else dt / ball.move_speed)
+        ball.x += ball.x_move * rest
+        ball.y += ball.y_move * rest
+        return True
+
+    def _collide_obstacles(self, ball: BallState) -> None:
+        """Reflect a ball off the first obstacle it reached during the last move"""
+        dx, dy = ball.x - ball.prev_x, ball.y - ball.prev_y
+        nearby = self.obstacle_grid.query(
+            sweep_bounds(ball.prev_x, ball.prev_y, dx, dy, ball.radius))
+        first = None
+        for obstacle in nearby:
+            hit = sweep_aabb(ball.prev_x, ball.prev_y, dx, dy, obstacle.get_edges(), ball.radius)
+            if hit is not None and (first is None or hit[0] < first[0]):
+                first = hit
+        if first is None:
+            return
+        t, normal_x, normal_y = first
+        # Stop at the surface and lose the rest of the tick, which keeps the
+        # ball from being carried into a neighbouring obstacle
+        ball.x = ball.prev_x + dx * t
+        ball.y = ball.prev_y + dy * t
+        ball.reflect(normal_x, normal_y)
+
+    def _collide_balls(self) -> None:
+        """Bounce touching balls off each other, found through the ball grid"""
+        grid = self.ball_grid
+        grid.clear()
+        for ball in self.balls:
+            r = ball.radius
+            grid.insert(ball, (ball.x - r, ball.x + r, ball.y + r, ball.y - r))
+        for first, second in grid.pairs():
+            dx, dy = second.x - first.x, second.y - first.y
+            reach = first.radius + second.radius
+            distance_sq = dx * dx + dy * dy
+            if distance_sq >= reach * reach or distance_sq == 0:
+                continue
+            distance = math.sqrt(distance_sq)
+            nx, ny = dx / distance, dy / distance
+            # Mirror each ball's velocity about the contact if it is closing in
+            for ball, sign in ((first, 1), (second, -1)):
+                along = (ball.x_move * nx + ball.y_move * ny) * sign
+                if along > 0:
+                    ball.x_move -= 2 * along * nx * sign
+                    ball.y_move -= 2 * along * ny * sign
+                    ball.bounces += 1
+            # Separate them so they do not collide again next tick
+            push = (reach - distance) / 2
+            first.x -= nx * push
+            first.y -= ny * push
+            second.x += nx * push
+            second.y += ny * push
+
+    def run(self, max_ticks: int, dt: Optional[float] = None) -> int:
+        """
+        Step the match until a side wins or max_ticks elapse
+
+        Args:
+            max_ticks: Upper bound on ticks to simulate
+            dt: Tick length passed to step (default: None)
+
+        Returns:
+            Number of ticks simulated
+        """
+        start = self.tick
+        while self.score.game_active and self.tick - start < max_ticks:
+            self.step(dt)
+        return self.tick - start
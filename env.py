@@ -0,0 +1,255 @@
+from typing import Optional, Tuple
+import numpy as np
+from engine import Match, ScoreState
+from batch import BatchMatch
+from controllers import CPUController
+from raster import Rasterizer
+
+ACTION_DIRECTIONS = (0, 1, -1)  # Actions: 0 stay, 1 up, 2 down
+OBSERVATION_SIZE = 8
+DEFAULT_DT = 1 / 120
+DEFAULT_FRAME_SKIP = 4
+
+
+class PongEnv:
+    """
+    Gym-style single-agent environment over the headless Match
+
+    The agent drives one paddle; the other is played by a CPUController or
+    left still. Observations are float32 vectors of:
+
+        ball x, ball y, ball x velocity, ball y velocity,
+        own paddle y, opponent paddle y, own score, opponent score
+
+    Positions are divided by half the field width, velocities are in half
+    field widths per second and scores are raw points. Each step repeats
+    the action for frame_skip physics ticks; the reward is +1 for every
+    point the agent wins and -1 for every point it loses. Given a
+    Rasterizer, observations are its (stack, height, width) uint8 frames
+    instead.
+    """
+
+    N_ACTIONS = len(ACTION_DIRECTIONS)
+    OBSERVATION_SIZE = OBSERVATION_SIZE
+
+    def __init__(
+            self,
+            frame_skip: int = DEFAULT_FRAME_SKIP,
+            dt: float = DEFAULT_DT,
+            side: str = "right",
+            opponent: Optional[str] = "default",
+            winning_score: int = ScoreState.DEFAULT_WINNING_SCORE,
+            max_steps: Optional[int] = None,
+            seed: Optional[int] = None,
+            rasterizer: Optional[Rasterizer] = None
+    ):
+        """
+        Initialize the environment
+
+        Args:
+            frame_skip: Physics ticks per step (default: 4)
+            dt: Physics tick length in seconds (default: 1/120)
+            side: Paddle the agent controls, "left" or "right" (default: right)
+            opponent: CPU level for the other paddle, or None to leave it still
+            winning_score: Points that end an episode (default: 11)
+            max_steps: Steps before an episode is truncated (default: no limit)
+            seed: Seed of the first episode (default: random)
+            rasterizer: Observe its stacked uint8 frames instead of the 8 floats
+        """
+        if side not in ("left", "right"):
+            raise ValueError(f"Unknown side: {side}")
+        self.frame_skip = frame_skip
+        self.dt = dt
+        self.side = side
+        self.max_steps = max_steps
+        self.match = Match(winning_score, seed)
+        self.steps = 0
+        if side == "right":
+            self.paddle, self.opponent_paddle = self.match.r_paddle, self.match.l_paddle
+        else:
+            self.paddle, self.opponent_paddle = self.match.l_paddle, self.match.r_paddle
+        self.opponent = (CPUController(self.opponent_paddle, opponent, budget_us=10 ** 6,
+                                       rng=self.match.rng)
+                         if opponent is not None else None)
+        self.rasterizer = rasterizer
+        self._obs = np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, dict]:
+        """
+        Start a new episode
+
+        Returns:
+            (observation, info)
+        """
+        self.match.reset(seed)
+        self.steps = 0
+        if self.opponent is not None:
+            self.opponent.reset()
+        if self.rasterizer is not None:
+            self.rasterizer.reset()
+        return self._observe(), {"seed": self.match.seed}
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, dict]:
+        """
+        Apply an action for frame_skip ticks
+
+        Args:
+            action: 0 to stay, 1 to move up, 2 to move down
+
+        Returns:
+            (observation, reward, terminated, truncated, info)
+        """
+        direction = ACTION_DIRECTIONS[action]
+        if direction:
+            self.paddle.start_move(direction)
+        else:
+            self.paddle.stop_move()
+
+        match, opponent, dt = self.match, self.opponent, self.dt
+        reward = 0.0
+        for _ in range(self.frame_skip):
+            if opponent is not None:
+                opponent.tick(match)
+            scorer = match.step(dt)
+            if scorer is not None:
+                reward += 1.0 if scorer == self.side else -1.0
+                if not match.score.game_active:
+                    break
+        self.steps += 1
+        terminated = not match.score.game_active
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self._observe(), reward, terminated, truncated, {"tick": match.tick}
+
+    def _observe(self) -> np.ndarray:
+        if self.rasterizer is not None:
+            self.rasterizer.render(self.match)
+            return self.rasterizer.frames.copy()
+        match, ball, obs = self.match, self.match.ball, self._obs
+        scale = 1 / Match.RIGHT_BOUNDARY
+        obs[0] = ball.x * scale
+        obs[1] = ball.y * scale
+        obs[2] = ball.x_move / ball.move_speed * scale
+        obs[3] = ball.y_move / ball.move_speed * scale
+        obs[4] = self.paddle.y * scale
+        obs[5] = self.opponent_paddle.y * scale
+        if self.side == "right":
+            obs[6], obs[7] = match.score.r_score, match.score.l_score
+        else:
+            obs[6], obs[7] = match.score.l_score, match.score.r_score
+        return obs.copy()
+
+
+class VectorPongEnv:
+    """
+    Many PongEnv-style environments stepped at once on a BatchMatch
+
+    The agents drive the right paddles. Left paddles follow the ball's
+    height when track_opponent is set, a vector stand-in for the CPU
+    opponent. reset and step have PongEnv's signatures with a leading n
+    axis. Finished episodes reset automatically: the observation returned
+    for them is the first of the new episode, and the last one of the old
+    episode is in info["final_observation"].
+    """
+
+    N_ACTIONS = len(ACTION_DIRECTIONS)
+    OBSERVATION_SIZE = OBSERVATION_SIZE
+    TRACK_DEAD_ZONE = CPUController.DEAD_ZONE
+
+    def __init__(
+            self,
+            n: int,
+            frame_skip: int = DEFAULT_FRAME_SKIP,
+            dt: float = DEFAULT_DT,
+            track_opponent: bool = True,
+            winning_score: int = ScoreState.DEFAULT_WINNING_SCORE,
+            max_steps: Optional[int] = None,
+            seed: Optional[int] = None
+    ):
+        """
+        Initialize the environments
+
+        Args:
+            n: Number of environments
+            frame_skip: Physics ticks per step (default: 4)
+            dt: Physics tick length in seconds (default: 1/120)
+            track_opponent: Move the left paddles after the ball (default: True)
+            winning_score: Points that end an episode (default: 11)
+            max_steps: Steps before an episode is truncated (default: no limit)
+            seed: Seed for the batch random generator (default: random)
+        """
+        self.n = n
+        self.frame_skip = frame_skip
+        self.dt = dt
+        self.track_opponent = track_opponent
+        self.max_steps = max_steps
+        self.batch = BatchMatch(n, winning_score, seed)
+        self.steps = np.zeros(n, dtype=np.int64)
+        self._directions = np.array(ACTION_DIRECTIONS, dtype=np.int8)
+        self._obs = np.zeros((n, OBSERVATION_SIZE), dtype=np.float32)
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, dict]:
+        """
+        Start new episodes in every environment
+
+        Args:
+            seed: Reseed the batch random generator first (default: keep it)
+
+        Returns:
+            (observations of shape (n, 8), info)
+        """
+        if seed is not None:
+            self.batch.rng = np.random.default_rng(seed)
+        self.batch.reset()
+        self.batch.l_dir[:] = 0
+        self.batch.r_dir[:] = 0
+        self.steps[:] = 0
+        return self._observe(), {"seed": seed}
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Apply one action per environment for frame_skip ticks
+
+        Args:
+            actions: Integer array of shape (n,) with 0 stay, 1 up, 2 down
+
+        Returns:
+            (observations, rewards, terminated, truncated, info), with shapes
+            (n, 8), (n,), (n,) and (n,)
+        """
+        batch = self.batch
+        batch.r_dir[:] = self._directions[actions]
+        rewards = np.zeros(self.n, dtype=np.float32)
+        for _ in range(self.frame_skip):
+            if self.track_opponent:
+                offset = batch.ball_y - batch.l_y
+                batch.l_dir[:] = (offset > self.TRACK_DEAD_ZONE).astype(np.int8) - (
+                    offset < -self.TRACK_DEAD_ZONE)
+            rewards -= batch.step(self.dt)  # +1 means the left side scored
+        self.steps += 1
+        terminated = ~batch.active
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+        else:
+            truncated = np.zeros(self.n, dtype=bool)
+        info = {"tick": batch.tick}
+        done = terminated | truncated
+        if done.any():
+            info["final_observation"] = self._observe()
+            batch.reset(done)
+            batch.l_dir[done] = 0
+            batch.r_dir[done] = 0
+            self.steps[done] = 0
+        return self._observe(), rewards, terminated, truncated, info
+
+    def _observe(self) -> np.ndarray:
+        batch, obs = self.batch, self._obs
+        scale = 1 / Match.RIGHT_BOUNDARY
+        obs[:, 0] = batch.ball_x * scale
+        obs[:, 1] = batch.ball_y * scale
+        obs[:, 2] = batch.x_move / batch.move_speed * scale
+        obs[:, 3] = batch.y_move / batch.move_speed * scale
+        obs[:, 4] = batch.r_y * scale
+        obs[:, 5] = batch.l_y * scale
+        obs[:, 6] = batch.r_score
+        obs[:, 7] = batch.l_score
+        return obs.copy()
@@ -0,0 +1,374 @@
+from typing import BinaryIO, Counter as CounterType, Dict, Iterable, Iterator, List, Optional, Sequence
+from array import array
+from collections import Counter
+from engine import BallState, Match
+from controllers import CPUController
+import argparse
+import json
+import math
+import queue
+import struct
+import sys
+import threading
+import time
+import zlib
+
+DEFAULT_QUEUE_SIZE = 65536  # Events buffered before emit starts dropping them
+BATCH_ROWS = 16384  # Most events written in one block or row group
+FLUSH_INTERVAL = 1.0  # Seconds before a partial batch is written anyway
+
+KINDS = ("hit", "wall", "point", "reset")
+KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+SIDE_CODES = {None: 0, "left": -1, "right": 1}
+SIDES = {code: side for side, code in SIDE_CODES.items()}
+
+# Column name and array typecode, in the order emit builds each event
+COLUMNS = (
+    ("seed", "q"),
+    ("tick", "q"),
+    ("kind", "B"),
+    ("side", "b"),
+    ("x", "f"),
+    ("y", "f"),
+    ("x_move", "f"),
+    ("y_move", "f"),
+    ("move_speed", "f"),
+    ("l_score", "I"),
+    ("r_score", "I"),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+# Built-in format: magic and version, then blocks of a row count followed
+# by one zlib-compressed little-endian array per column, each length-prefixed
+MAGIC = b"PNGE"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sH")
+LENGTH = struct.Struct("<I")
+PARQUET_MAGIC = b"PAR1"
+
+
+def _parquet():
+    """pyarrow.parquet, or None if pyarrow is not installed; imported on first use since it loads slowly"""
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow.parquet
+
+
+class _BlockWriter:
+    """Writes column batches in the built-in block format"""
+
+    def __init__(self, path: str):
+        self.file = open(path, 'wb')
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, columns: List[array], rows: int) -> None:
+        parts = [LENGTH.pack(rows)]
+        for values in columns:
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            data = zlib.compress(values.tobytes())
+            parts.append(LENGTH.pack(len(data)))
+            parts.append(data)
+        self.file.write(b"".join(parts))
+        self.file.flush()  # Readers and crashes only ever see whole blocks
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class _ParquetWriter:
+    """Writes column batches as row groups of a zstd-compressed Parquet file"""
+
+    TYPES = {"q": "int64", "B": "uint8", "b": "int8", "f": "float32", "I": "uint32"}
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+        self.pa = pa
+        self.schema = pa.schema([(name, getattr(pa, self.TYPES[code])()) for name, code in COLUMNS])
+        self.writer = _parquet().ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, columns: List[array], rows: int) -> None:
+        pa = self.pa
+        self.writer.write_table(pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class EventLog:
+    """
+    Records match events to a columnar file from a background thread
+
+    Set it as match.events and the match reports every paddle hit, wall
+    bounce, point and reset. emit only puts a tuple on a bounded queue and
+    drops the event if the queue is full, so a slow disk can never stall
+    the game loop; dropped counts what was lost. The writer thread batches
+    events into compressed column blocks: Parquet row groups when pyarrow
+    is installed, otherwise the built-in format that read_batches also
+    understands.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            maxsize: int = DEFAULT_QUEUE_SIZE,
+            batch_rows: int = BATCH_ROWS,
+            flush_interval: float = FLUSH_INTERVAL,
+            parquet: Optional[bool] = None
+    ):
+        """
+        Open the output file and start the writer thread
+
+        Args:
+            path: Output file, replaced if it exists
+            maxsize: Events buffered before new ones are dropped (default: 65536)
+            batch_rows: Most events per written block (default: 16384)
+            flush_interval: Seconds before a partial block is written (default: 1.0)
+            parquet: Write Parquet; None to do so when pyarrow is installed
+
+        Raises:
+            ImportError: If parquet is True and pyarrow is not installed
+        """
+        if parquet is None:
+            parquet = _parquet() is not None
+        elif parquet and _parquet() is None:
+            raise ImportError("Parquet output needs pyarrow")
+        self.path = path
+        self.batch_rows = batch_rows
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._sink = _ParquetWriter(path) if parquet else _BlockWriter(path)
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize)
+        self._writer = threading.Thread(target=self._write_loop, name="event-log", daemon=True)
+        self._writer.start()
+
+    def emit(self, kind: str, match: Match, ball: BallState, side: Optional[str] = None) -> None:
+        """
+        Queue one event; returns immediately
+
+        Args:
+            kind: One of KINDS
+            match: Match it happened in, for its seed, tick and score
+            ball: Ball involved, recorded after the event
+            side: Paddle hit or side that scored, if any
+        """
+        score = match.score
+        try:
+            self._queue.put_nowait((match.seed, match.tick, KIND_CODES[kind], SIDE_CODES[side],
+                                    ball.x, ball.y, ball.x_move, ball.y_move, ball.move_speed,
+                                    score.l_score, score.r_score))
+        except queue.Full:
+            self.dropped += 1
+
+    def _write_loop(self) -> None:
+        columns = [array(code) for _, code in COLUMNS]
+        rows = 0
+        written_at = time.monotonic()
+        stop = False
+        while not stop:
+            try:
+                event = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                event = ()
+            while event is not None:
+                if event:
+                    for values, value in zip(columns, event):
+                        values.append(value)
+                    rows += 1
+                if rows >= self.batch_rows:
+                    break
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            stop = event is None
+            now = time.monotonic()
+            if rows and (stop or rows >= self.batch_rows or now - written_at >= self.flush_interval):
+                self._sink.write(columns, rows)
+                columns = [array(code) for _, code in COLUMNS]
+                rows = 0
+                written_at = now
+        self._sink.close()
+
+    def close(self) -> None:
+        """Write everything queued and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+
+def _read_blocks(file: BinaryIO, wanted: Sequence[str]) -> Iterator[Dict[str, Sequence]]:
+    magic, version = FILE_HEADER.unpack(file.read(FILE_HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{file.name} is not a version {VERSION} Pong event log")
+    while True:
+        header = file.read(LENGTH.size)
+        if len(header) < LENGTH.size:
+            return
+        batch = {}
+        for name, code in COLUMNS:
+            length = file.read(LENGTH.size)
+            if len(length) < LENGTH.size:
+                return  # Truncated last block, e.g. after a crash
+            length = LENGTH.unpack(length)[0]
+            if name not in wanted:
+                file.seek(length, 1)
+                continue
+            data = file.read(length)
+            if len(data) < length:
+                return
+            values = array(code)
+            values.frombytes(zlib.decompress(data))
+            if sys.byteorder == "big":
+                values.byteswap()
+            batch[name] = values
+        yield batch
+
+
+def read_batches(path: str, columns: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Sequence]]:
+    """
+    Stream an event log one block at a time
+
+    Only one block is held in memory, so logs of any size can be scanned.
+
+    Args:
+        path: File written by EventLog, in either format
+        columns: Columns to decode (default: all of COLUMN_NAMES)
+
+    Yields:
+        A dict of column name to values for each block
+    """
+    wanted = list(columns) if columns is not None else list(COLUMN_NAMES)
+    with open(path, 'rb') as file:
+        if file.read(len(PARQUET_MAGIC)) == PARQUET_MAGIC:
+            pq = _parquet()
+            if pq is None:
+                raise ImportError(f"{path} is Parquet; reading it needs pyarrow")
+        else:
+            file.seek(0)
+            yield from _read_blocks(file, wanted)
+            return
+    for batch in pq.ParquetFile(path).iter_batches(columns=wanted):
+        yield {name: batch.column(name).to_pylist() for name in wanted}
+
+
+class EventStats:
+    """
+    Streaming aggregates over event batches, in constant memory per match
+    """
+
+    COLUMNS = ("seed", "kind", "side", "x_move", "y_move", "move_speed")
+
+    def __init__(self):
+        self.events = 0
+        self.counts: CounterType[str] = Counter()
+        self.points: CounterType[str] = Counter()
+        self.rallies: CounterType[int] = Counter()  # Paddle hits before each point
+        self.hit_speed_total = 0.0
+        self.max_hit_speed = 0.0
+        self._rally_hits: Dict[int, int] = {}  # Per match seed
+
+    def add(self, batch: Dict[str, Sequence]) -> None:
+        """Fold in one batch from read_batches"""
+        hit, point, reset = KIND_CODES["hit"], KIND_CODES["point"], KIND_CODES["reset"]
+        rally_hits = self._rally_hits
+        kinds: CounterType[int] = Counter()
+        for seed, kind, side, x_move, y_move, move_speed in zip(*(batch[name] for name in self.COLUMNS)):
+            kinds[kind] += 1
+            if kind == hit:
+                rally_hits[seed] = rally_hits.get(seed, 0) + 1
+                speed = math.hypot(x_move, y_move) / move_speed
+                self.hit_speed_total += speed
+                if speed > self.max_hit_speed:
+                    self.max_hit_speed = speed
+            elif kind == point:
+                self.points[SIDES[side]] += 1
+                self.rallies[rally_hits.pop(seed, 0)] += 1
+            elif kind == reset:
+                rally_hits.pop(seed, None)
+        for kind, count in kinds.items():
+            self.counts[KINDS[kind]] += count
+            self.events += count
+
+    def summary(self) -> dict:
+        hits = self.counts["hit"]
+        points = sum(self.rallies.values())
+        return {
+            "events": self.events,
+            "counts": {kind: self.counts[kind] for kind in KINDS},
+            "points": {"left": self.points["left"], "right": self.points["right"]},
+            "rally_mean": round(sum(length * count for length, count in self.rallies.items()) / points, 3)
+            if points else None,
+            "rally_max": max(self.rallies, default=0),
+            "mean_hit_speed": round(self.hit_speed_total / hits, 1) if hits else None,
+            "max_hit_speed": round(self.max_hit_speed, 1),
+        }
+
+
+def aggregate(paths: Iterable[str]) -> EventStats:
+    """Stream every event in the given logs through one EventStats"""
+    stats = EventStats()
+    for path in paths:
+        for batch in read_batches(path, EventStats.COLUMNS):
+            stats.add(batch)
+    return stats
+
+
+def record(path: str, matches: int, seed: int, level: str, max_minutes: float,
+           parquet: Optional[bool]) -> EventLog:
+    """Play CPU-vs-CPU matches headlessly into an event log, e.g. to build test data"""
+    dt = 1 / 120
+    max_ticks = int(max_minutes * 60 / dt)
+    log = EventLog(path, parquet=parquet)
+    match = Match(seed=seed)
+    match.events = log
+    players = (CPUController(match.l_paddle, level, rng=match.rng, budget_us=10 ** 6),
+               CPUController(match.r_paddle, level, rng=match.rng, budget_us=10 ** 6))
+    for n in range(matches):
+        match.reset(seed + n)
+        while match.score.game_active and match.tick < max_ticks:
+            for player in players:
+                player.tick(match)
+            match.step(dt)
+    log.close()
+    return log
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record and summarize Pong event logs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    summarize = commands.add_parser("summarize", help="stream logs and print aggregate statistics")
+    summarize.add_argument("paths", nargs="+", metavar="PATH")
+    generate = commands.add_parser("record", help="log simulated CPU-vs-CPU matches")
+    generate.add_argument("path", metavar="PATH")
+    generate.add_argument("--matches", type=int, default=100)
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--level", default="easy", help="CPU difficulty of both players")
+    generate.add_argument("--max-minutes", type=float, default=10.0,
+                          help="simulated minutes before a match is cut off")
+    generate.add_argument("--format", choices=("auto", "parquet", "blocks"), default="auto")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "record":
+        parquet = {"auto": None, "parquet": True, "blocks": False}[args.format]
+        try:
+            log = record(args.path, args.matches, args.seed, args.level, args.max_minutes, parquet)
+        except ImportError as error:
+            parser.error(str(error))
+        print(f"{args.matches} matches logged to {args.path} in {time.perf_counter() - start:.1f}s"
+              f" ({log.dropped} events dropped)")
+    else:
+        stats = aggregate(args.paths)
+        elapsed = time.perf_counter() - start
+        print(json.dumps(stats.summary(), indent=2))
+        print(f"{stats.events} events in {elapsed:.1f}s ({stats.events / elapsed:.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+from typing import Optional, Tuple
+from engine import BallState, Match, PaddleState, ScoreState
+from trajectory import intercept_y
+import argparse
+import math
+import random
+
+FRACTION_BITS = 16
+ONE = 1 << FRACTION_BITS  # Fixed-point 1.0: every length is stored as pixels * ONE
+ANGLE_STEPS = 16  # Lookup table entries per degree
+FULL_TURN = 360 * ANGLE_STEPS
+
+
+def _build_sin_table() -> Tuple[int, ...]:
+    """
+    Sine in fixed point for every table angle, built with integer arithmetic only
+
+    math.sin may differ in the last bit between C libraries, so the table is
+    summed as a Taylor series on large integers instead. The result is the
+    same on every platform.
+    """
+    precision = 1 << 62
+    pi = int(math.pi * (1 << 52)) << 10  # math.pi is exact IEEE, so this is portable
+    table = []
+    for step in range(FULL_TURN // 4 + 1):
+        x = pi * step // (180 * ANGLE_STEPS)
+        term = total = x
+        k = 1
+        while term:
+            term = -term * x // precision * x // precision // ((2 * k) * (2 * k + 1))
+            total += term
+            k += 1
+        table.append((total + (1 << 45)) >> 46)  # Round to FRACTION_BITS
+    quarter = FULL_TURN // 4
+    full = [0] * FULL_TURN
+    for step in range(FULL_TURN):
+        quadrant, offset = divmod(step, quarter)
+        value = table[offset] if quadrant % 2 == 0 else table[quarter - offset]
+        full[step] = value if quadrant < 2 else -value
+    return tuple(full)
+
+
+SIN_TABLE = _build_sin_table()
+COS_TABLE = tuple(SIN_TABLE[(step + FULL_TURN // 4) % FULL_TURN] for step in range(FULL_TURN))
+
+
+def angle_step(degrees: float) -> int:
+    """Nearest lookup table angle to an angle in degrees"""
+    return round(degrees * ANGLE_STEPS) % FULL_TURN
+
+
+def to_fixed(value: float) -> int:
+    return round(value * ONE)
+
+
+class FixedBallState:
+    """
+    Ball state with integer fixed-point position, velocity and speed
+
+    x, y, x_move and y_move are in pixels * ONE, and move_speed is in
+    seconds * ONE. Float views of them (x, y, ...) are provided for
+    controllers and rendering.
+    """
+
+    __slots__ = (
+        "fx", "fy", "fx_move", "fy_move", "speed", "initial_speed", "initial_move_distance",
+        "min_speed", "speed_decay", "bounce_spread", "radius", "bounces", "rng",
+        "step_x", "step_y"
+    )
+
+    def __init__(self, rng: random.Random, hz: int):
+        self.rng = rng
+        self.initial_speed = to_fixed(BallState.DEFAULT_SPEED)
+        self.initial_move_distance = tuple(map(to_fixed, BallState.DEFAULT_MOVE_DISTANCE))
+        self.min_speed = to_fixed(BallState.MIN_SPEED)
+        self.speed_decay = to_fixed(BallState.SPEED_DECAY)
+        self.bounce_spread = BallState.BOUNCE_SPREAD
+        self.radius = BallState.DEFAULT_RADIUS
+        self.bounces = 0
+        self.fx = self.fy = 0
+        self.speed = self.initial_speed
+        self.fx_move, self.fy_move = self.initial_move_distance
+        self.step_x = self.step_y = 0  # Displacement per tick, kept in step with the velocity
+        self._randomize_direction(hz)
+
+    @property
+    def x(self) -> float:
+        return self.fx / ONE
+
+    @property
+    def y(self) -> float:
+        return self.fy / ONE
+
+    @property
+    def x_move(self) -> float:
+        return self.fx_move / ONE
+
+    @property
+    def y_move(self) -> float:
+        return self.fy_move / ONE
+
+    @property
+    def move_speed(self) -> float:
+        return self.speed / ONE
+
+    def _update_steps(self, hz: int) -> None:
+        """Per-tick displacement: a full move every move_speed seconds"""
+        divisor = hz * self.speed
+        self.step_x = self.fx_move * ONE // divisor
+        self.step_y = self.fy_move * ONE // divisor
+
+    def _randomize_direction(self, hz: int) -> None:
+        """BallState._randomize_direction with the direction taken from the tables"""
+        angle = self.rng.uniform(-60, 60)
+        if self.rng.random() < 0.5:
+            angle += 180
+        step = angle_step(angle)
+        speed = math.isqrt(self.fx_move * self.fx_move + self.fy_move * self.fy_move)
+        self.fx_move = speed * COS_TABLE[step] >> FRACTION_BITS
+        self.fy_move = speed * SIN_TABLE[step] >> FRACTION_BITS
+        self._update_steps(hz)
+
+    def _add_randomness_to_bounce(self) -> None:
+        """BallState._add_randomness_to_bounce as an integer rotation"""
+        step = angle_step(self.rng.uniform(-self.bounce_spread, self.bounce_spread))
+        cos, sin = COS_TABLE[step], SIN_TABLE[step]
+        x_move, y_move = self.fx_move, self.fy_move
+        self.fx_move = (x_move * cos - y_move * sin) >> FRACTION_BITS
+        self.fy_move = (x_move * sin + y_move * cos) >> FRACTION_BITS
+
+    def bounce_x(self, hz: int) -> None:
+        self.fx_move = -self.fx_move
+        self.bounces += 1
+        self._add_randomness_to_bounce()
+        self.speed = max(self.min_speed, self.speed * self.speed_decay >> FRACTION_BITS)
+        self._update_steps(hz)
+
+    def bounce_y(self, hz: int) -> None:
+        self.fy_move = -self.fy_move
+        self.bounces += 1
+        self._add_randomness_to_bounce()
+        self._update_steps(hz)
+
+    def reset_position(self, hz: int) -> None:
+        self.fx = self.fy = 0
+        self.speed = self.initial_speed
+        self.fx_move, self.fy_move = self.initial_move_distance
+        self.bounces += 1
+        self._randomize_direction(hz)
+
+
+class FixedMatch:
+    """
+    Headless match with integer fixed-point physics at a fixed tick rate
+
+    Follows the Match rules, but every position, velocity and speed is an
+    integer and bounce angles come from lookup tables, so the same seed and
+    inputs give bit-identical matches on every platform. Bounce angles are
+    drawn exactly as Match draws them and rounded to the table, so a
+    FixedMatch closely tracks a Match with the same seed. Paddles are
+    PaddleStates driven through start_move/stop_move as usual; their heights
+    are kept in fixed point here and copied to them each tick.
+    """
+
+    UPPER_BOUNDARY = to_fixed(Match.UPPER_BOUNDARY)
+    LOWER_BOUNDARY = to_fixed(Match.LOWER_BOUNDARY)
+    RIGHT_BOUNDARY = to_fixed(Match.RIGHT_BOUNDARY)
+    LEFT_BOUNDARY = to_fixed(Match.LEFT_BOUNDARY)
+    PADDLE_LIMIT = to_fixed(PaddleState.UPPER_BOUNDARY)
+
+    def __init__(
+            self,
+            hz: int = 120,
+            winning_score: int = ScoreState.DEFAULT_WINNING_SCORE,
+            seed: Optional[int] = None
+    ):
+        """
+        Initialize a new match
+
+        Args:
+            hz: Physics ticks per second (default: 120)
+            winning_score: Points needed to win (default: 11)
+            seed: Seed for this match's random generator (default: random)
+        """
+        self.hz = hz
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+        self.ball = FixedBallState(self.rng, hz)
+        self.r_paddle = PaddleState(Match.R_PADDLE_POSITION)
+        self.l_paddle = PaddleState(Match.L_PADDLE_POSITION)
+        self.paddle_y = [to_fixed(self.l_paddle.y), to_fixed(self.r_paddle.y)]
+        # move_increment pixels every PADDLE_STEP_TIME seconds
+        self.paddle_step = round(PaddleState.DEFAULT_MOVE_INCREMENT * ONE
+                                 / (hz * Match.PADDLE_STEP_TIME))
+        self.score = ScoreState(winning_score)
+        self.tick = 0
+
+    def step(self) -> Optional[str]:
+        """
+        Advance the match by one tick of 1/hz seconds
+
+        Returns:
+            "left" or "right" when that side scored this tick, otherwise None
+        """
+        self.tick += 1
+        ball, hz = self.ball, self.hz
+        for index, paddle in enumerate((self.l_paddle, self.r_paddle)):
+            paddle.prev_y = paddle.y
+            if paddle.moving and paddle.direction:
+                y = self.paddle_y[index] + self.paddle_step * (1 if paddle.direction > 0 else -1)
+                y = max(-self.PADDLE_LIMIT, min(self.PADDLE_LIMIT, y))
+                self.paddle_y[index] = y
+                paddle.y = y / ONE
+
+        prev_x, prev_y = ball.fx, ball.fy
+        ball.fx += ball.step_x
+        ball.fy += ball.step_y
+
+        if ball.fx_move > 0:
+            self._collide_paddle(prev_x, prev_y, self.r_paddle, self.paddle_y[1])
+        elif ball.fx_move < 0:
+            self._collide_paddle(prev_x, prev_y, self.l_paddle, self.paddle_y[0])
+
+        if ((ball.fy > self.UPPER_BOUNDARY and ball.fy_move > 0) or
+                (ball.fy < self.LOWER_BOUNDARY and ball.fy_move < 0)):
+            ball.bounce_y(hz)
+
+        if ball.fx > self.RIGHT_BOUNDARY:
+            ball.reset_position(hz)
+            self.score.l_point()
+            return "left"
+        if ball.fx < self.LEFT_BOUNDARY:
+            ball.reset_position(hz)
+            self.score.r_point()
+            return "right"
+        return None
+
+    def _collide_paddle(self, x: int, y: int, paddle: PaddleState, paddle_y: int) -> bool:
+        """
+        collision.sweep_aabb and Match._collide_paddle in exact integer arithmetic
+
+        Times of impact are kept as fractions (numerator, denominator) so
+        that no rounding happens until the impact point is placed.
+        """
+        ball = self.ball
+        dx, dy = ball.fx - x, ball.fy - y
+        radius = ball.radius * ONE
+        half_width = to_fixed(paddle.size[1] * 10) + radius
+        half_height = to_fixed(paddle.size[0] * 10) + radius
+        paddle_x = to_fixed(paddle.x)
+        left, right = paddle_x - half_width, paddle_x + half_width
+        bottom, top = paddle_y - half_height, paddle_y + half_height
+
+        enter_num, enter_den, exit_num, exit_den = 0, 1, 1, 1
+        hit_face = False
+        for start, delta, low, high in ((x, dx, left, right), (y, dy, bottom, top)):
+            if delta == 0:
+                if start < low or start > high:
+                    return False
+                continue
+            if delta > 0:
+                near, far, den = low - start, high - start, delta
+            else:
+                near, far, den = start - high, start - low, -delta
+            if near * enter_den > enter_num * den:
+                enter_num, enter_den = near, den
+                hit_face = True
+            if far * exit_den < exit_num * den:
+                exit_num, exit_den = far, den
+            if enter_num * exit_den > exit_num * enter_den:
+                return False
+        if not hit_face:
+            return False  # Overlapping from the start of the tick
+
+        ball.fx = x + dx * enter_num // enter_den
+        ball.fy = y + dy * enter_num // enter_den
+        ball.bounce_x(self.hz)
+        remaining = enter_den - enter_num
+        ball.fx += ball.step_x * remaining // enter_den
+        ball.fy += ball.step_y * remaining // enter_den
+        return True
+
+    def predict_intercept(self, target_x: float) -> Optional[float]:
+        """Match.predict_intercept, for CPU controllers"""
+        hit = intercept_y(self.ball.x, self.ball.y, self.ball.x_move, self.ball.y_move,
+                          target_x, Match.LOWER_BOUNDARY, Match.UPPER_BOUNDARY)
+        return None if hit is None else hit[0]
+
+
+def agreement(seeds: int = 200, ticks: int = 1200) -> Tuple[float, int]:
+    """
+    Compare float and fixed-point physics over the same seeds
+
+    Both modes draw the same random numbers, and in both the paddles follow
+    the ball. A rounding difference can move a bounce by one tick, so ticks
+    on which the two balls have bounced a different number of times are
+    skipped. Pong is chaotic, though: eventually a paddle edge catches one
+    ball and misses the other, and from then on the matches are unrelated.
+    A match whose bounce counts stay apart for more than a couple of ticks
+    is counted as parted and compared no further.
+
+    Returns:
+        (largest ball position difference in pixels, matches that parted ways)
+    """
+    worst = 0.0
+    parted = 0
+    dt = 1 / 120
+    for seed in range(seeds):
+        float_match, fixed_match = Match(seed=seed), FixedMatch(120, seed=seed)
+        apart = 0
+        for _ in range(ticks):
+            for match in (float_match, fixed_match):
+                for paddle in (match.l_paddle, match.r_paddle):
+                    offset = match.ball.y - paddle.y
+                    paddle.start_move(1 if offset > 4 else -1 if offset < -4 else 0)
+            float_match.step(dt)
+            fixed_match.step()
+            if float_match.ball.bounces != fixed_match.ball.bounces:
+                apart += 1
+                if apart > 2:
+                    parted += 1
+                    break
+                continue
+            apart = 0
+            worst = max(worst, math.hypot(float_match.ball.x - fixed_match.ball.x,
+                                          float_match.ball.y - fixed_match.ball.y))
+    return worst, parted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check fixed-point physics against float physics")
+    parser.add_argument("--seeds", type=int, default=200)
+    parser.add_argument("--ticks", type=int, default=1200, help="ticks compared per seed")
+    parser.add_argument("--tolerance", type=float, default=5.0, help="pixels")
+    args = parser.parse_args()
+    worst, parted = agreement(args.seeds, args.ticks)
+    print(f"largest difference {worst:.3f}px; {parted} of {args.seeds} matches parted ways")
+    if worst > args.tolerance or parted > args.seeds // 20:
+        raise SystemExit("float and fixed-point physics disagree")
+
+
+if __name__ == "__main__":
+    main()
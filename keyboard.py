@@ -0,0 +1,79 @@
+from typing import Dict, Iterable
+from engine import Match, PaddleState
+from controllers import PaddleController
+
+
+class KeyboardInput:
+    """
+    Tracks which bound keys are currently held down
+
+    Press and release events only update a flag; paddles read the flags once
+    per physics tick, so movement no longer depends on the OS key-repeat rate.
+    """
+
+    def __init__(self, screen, keys: Iterable[str] = ()):
+        """
+        Initialize keyboard state tracking
+
+        Args:
+            screen: Turtle screen that delivers the key events
+            keys: Key names to track, as accepted by screen.onkeypress
+        """
+        self.screen = screen
+        self.held: Dict[str, bool] = {key: False for key in keys}
+
+    def add_keys(self, *keys: str) -> None:
+        """Start tracking more keys; call install() afterwards"""
+        for key in keys:
+            self.held.setdefault(key, False)
+
+    def install(self) -> None:
+        """(Re)register press and release handlers and forget stale presses"""
+        for key in self.held:
+            self.held[key] = False
+            self.screen.onkeypress(lambda key=key: self._set(key, True), key)
+            self.screen.onkeyrelease(lambda key=key: self._set(key, False), key)
+
+    def _set(self, key: str, is_down: bool) -> None:
+        self.held[key] = is_down
+
+    def is_held(self, key: str) -> bool:
+        """Whether key is currently held down"""
+        return self.held.get(key, False)
+
+
+class KeyboardController(PaddleController):
+    """
+    Moves a paddle while its up or down key is held
+    """
+
+    def __init__(
+            self,
+            paddle: PaddleState,
+            keyboard: KeyboardInput,
+            up_key: str,
+            down_key: str,
+            **kwargs
+    ):
+        """
+        Initialize a keyboard-driven paddle
+
+        Args:
+            paddle: Paddle state to drive
+            keyboard: Shared key state
+            up_key: Key that moves the paddle up
+            down_key: Key that moves the paddle down
+            **kwargs: Passed on to PaddleController
+        """
+        super().__init__(paddle, **kwargs)
+        self.keyboard = keyboard
+        self.up_key = up_key
+        self.down_key = down_key
+        keyboard.add_keys(up_key, down_key)
+
+    def control(self, match: Match) -> None:
+        direction = self.keyboard.is_held(self.up_key) - self.keyboard.is_held(self.down_key)
+        if direction:
+            self.paddle.start_move(direction)
+        else:
+            self.paddle.stop_move()
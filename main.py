@@ -1,10 +1,19 @@
+import time
+IMPORTS_STARTED = time.perf_counter()  # Start of the "imports" phase of --startup-profile
 import tkinter as tk
-from tkinter import colorchooser, messagebox
 from turtle import Screen
 from paddle import Paddle
 from ball import Ball
 from scoreboard import Scoreboard
-import time
+from score_store import ScoreStore
+from engine import BallState, Match
+from timestep import FixedTimestep
+from keyboard import KeyboardInput, KeyboardController
+from controllers import CPUController
+from renderer import Renderer, SpritePool
+import argparse
+# Modules behind command-line flags (replay, profiler, powerups, pickup,
+# state_feed, events) are imported where they are used
 
 class PongGame:
     # Constants for setup
@@ -18,38 +27,104 @@ class PongGame:
     LOWER_BOUNDARY = -SCREEN_HEIGHT / 2 + 10
     RIGHT_BOUNDARY = SCREEN_WIDTH / 2
     LEFT_BOUNDARY = -SCREEN_WIDTH / 2
+    FRAME_INTERVAL_MS = 16  # Render roughly 60 times a second
+
+    def __init__(
+            self,
+            physics_hz: float = FixedTimestep.DEFAULT_HZ,
+            record_path: str = None,
+            profile: bool = False,
+            trace_path: str = None,
+            startup_profile: bool = False,
+            powerups: bool = False,
+            feed_name: str = None,
+            events_path: str = None
+    ):
+        # Only startup_profile times the phases up to the first frame
+        self.startup = None
+        if startup_profile:
+            from profiler import StartupTimer
+            self.startup = StartupTimer(IMPORTS_STARTED)
+            self.startup.mark("imports")
 
-    def __init__(self):
         # Screen setup
         self.screen = Screen()
         self.screen.setup(width=self.SCREEN_WIDTH, height=self.SCREEN_HEIGHT)
         self.screen.title("PONG GAME - ENHANCED EDITION")
         self.screen.bgcolor("black")
         self.screen.tracer(0)
-
-        # Game objects
-        self.ball = Ball()
-        self.scoreboard = Scoreboard()
-        self.r_paddle = Paddle(self.R_PADDLE_POSITION)
-        self.l_paddle = Paddle(self.L_PADDLE_POSITION)
+        if self.startup is not None:
+            self.startup.mark("screen")
+
+        # Simulation state and the turtles that render it
+        self.match = Match()
+        self.ball = Ball(state=self.match.ball)
+        self.scoreboard = Scoreboard(match=self.match)  # The score store is opened after the first frame
+        self.r_paddle = Paddle(self.R_PADDLE_POSITION, state=self.match.r_paddle)
+        self.l_paddle = Paddle(self.L_PADDLE_POSITION, state=self.match.l_paddle)
+        self.renderer = Renderer(self.screen)
+        self.renderer.add(self.ball, self.r_paddle, self.l_paddle)
+        self.powerups = None
+        if powerups:
+            from powerups import PowerUps
+            from pickup import Pickup
+            self.powerups = PowerUps(self.match)
+            self.pickup_sprites = SpritePool(self.renderer, Pickup, PowerUps.MAX_PICKUPS)
+            self.ball_sprites = SpritePool(
+                self.renderer, lambda: Ball(state=BallState()), PowerUps.MAX_EXTRA_BALLS)
+        if self.startup is not None:
+            self.startup.mark("sprites")
 
         # Game state
         self.is_paused = False
         self.game_speed = 1.0
         self.winning_score = 5
+        self.scoreboard.set_winning_score(self.winning_score)
         self.game_active = True
         self.current_difficulty = "default"
-
-        # Initialize UI
-        self.setup_controls()
+        self.clock = FixedTimestep(physics_hz)
+        self.keyboard = KeyboardInput(self.screen)
+        self.r_player = KeyboardController(self.match.r_paddle, self.keyboard, "Up", "Down")
+        self.l_player = KeyboardController(self.match.l_paddle, self.keyboard, "w", "s")
+        self.cpu_opponent = None  # CPUController on the left paddle in single-player mode
+        self.record_path = record_path
+        self.recorder = None
+        if record_path:
+            from replay import InputRecorder
+            self.recorder = InputRecorder(self.match, self.clock.dt)
+        # None unless profiling, so the disabled cost is a single check per phase
+        self.profiler = None
+        if profile or trace_path:
+            from profiler import FrameProfiler
+            self.profiler = FrameProfiler(self.screen, trace_path)
+        # Shared memory copy of every tick's state for spectator and overlay processes
+        self.feed = None
+        if feed_name:
+            from state_feed import StateFeed
+            self.feed = StateFeed(feed_name)
+        # Hits, bounces, points and resets, written to a columnar log off the game thread
+        self.events = None
+        if events_path:
+            from events import EventLog
+            self.events = EventLog(events_path)
+            self.match.events = self.events
+
+        # The control window is built the first time it is opened
+        self.root = None
+        self.pause_button = None
+        self.cpu_button = None
         self.setup_keybindings()
+        if self.startup is not None:
+            self.startup.mark("game state")
 
         # Start game
         self.game_loop()
+        self.screen.ontimer(self.open_score_store, 0)
 
     def setup_controls(self):
         """Initialize the control window and buttons"""
-        self.root = tk.Tk()
+        # A window of the turtle screen's Tk app, rather than a second Tk interpreter
+        self.root = tk.Toplevel(self.screen.getcanvas().winfo_toplevel())
         self.root.withdraw()
         self.root.title("Pong Game Controls")
         self.root.geometry("400x300")
@@ -61,7 +136,7 @@ class PongGame:
         # Pause button
         self.pause_button = tk.Button(
             controls_frame,
-            text="Pause",
+            text="Resume" if self.is_paused else "Pause",
             command=self.toggle_pause,
             width=15
         )
@@ -121,40 +196,56 @@ class PongGame:
             width=15
         ).pack(pady=2)
 
+        # Single-player mode
+        self.cpu_button = tk.Button(
+            controls_frame,
+            text="Play vs CPU" if self.cpu_opponent is None else "Two Players",
+            command=self.toggle_cpu_opponent,
+            width=15
+        )
+        self.cpu_button.pack(pady=2)
+
         self.root.protocol("WM_DELETE_WINDOW", self.hide_controls)
 
     def setup_keybindings(self):
         """Set up keyboard controls"""
         self.screen.listen()
-        self.screen.onkeypress(self.r_paddle.go_up, "Up")
-        self.screen.onkeypress(self.r_paddle.go_down, "Down")
-        self.screen.onkeypress(self.l_paddle.go_up, "w")
-        self.screen.onkeypress(self.l_paddle.go_down, "s")
+        self.keyboard.install()  # Paddles follow held keys once per physics tick
         self.screen.onkey(self.toggle_pause, "space")
         self.screen.onclick(self.open_controls)
 
     def toggle_pause(self):
         """Toggle game pause state"""
         self.is_paused = not self.is_paused
-        self.pause_button.config(text="Resume" if self.is_paused else "Pause")
+        if self.pause_button is not None:
+            self.pause_button.config(text="Resume" if self.is_paused else "Pause")
         self.setup_keybindings()  # Re-bind keys after pausing or resuming
 
     def reset_game(self):
         """Reset the game state"""
+        self.match.reset()
+        if self.powerups is not None:
+            self.powerups.reset()
         self.scoreboard.reset_scores()
-        self.ball.reset_position()
+        self.ball.clear_trail()
+        if self.recorder is not None:
+            self.recorder.restart()
         self.game_active = True
         self.is_paused = False
-        self.pause_button.config(text="Pause")
+        if self.pause_button is not None:
+            self.pause_button.config(text="Pause")
         self.setup_keybindings()  # Re-bind keys after resetting the game
 
     def update_speed(self, value):
         """Update game speed"""
         self.game_speed = float(value)
         self.ball.move_speed = 0.1 / self.game_speed
+        if self.recorder is not None:
+            self.recorder.record_speed(self.ball.move_speed)  # Replays must see the change too
 
     def update_speed_from_entry(self):
         """Update game speed from the entry widget"""
+        from tkinter import messagebox
         try:
             speed_value = float(self.speed_entry.get())
             if speed_value > 0:
@@ -164,33 +255,58 @@ class PongGame:
 
     def set_difficulty(self, mode):
         """Set game difficulty"""
+        if self.powerups is not None:
+            self.powerups.reset()  # Undo paddle effects before setting new heights
         if mode == "easy":
             if self.current_difficulty != "easy":
                 self.current_difficulty = "easy"
                 self.ball.move_speed = 0.1
-                self.r_paddle.shapesize(stretch_wid=6, stretch_len=1)  # More spread out in Y-axis only
-                self.l_paddle.shapesize(stretch_wid=6, stretch_len=1)
+                self.r_paddle.set_height(6)  # More spread out in Y-axis only
+                self.l_paddle.set_height(6)
             else:
                 self.current_difficulty = "default"
                 self.ball.move_speed = 0.1
-                self.r_paddle.shapesize(stretch_wid=5, stretch_len=1)
-                self.l_paddle.shapesize(stretch_wid=5, stretch_len=1)
+                self.r_paddle.set_height(5)
+                self.l_paddle.set_height(5)
         elif mode == "hard":
             self.current_difficulty = "hard"
             self.ball.move_speed = 0.05
-            self.r_paddle.shapesize(stretch_wid=3, stretch_len=1)  # Smaller paddle in Y-axis only
-            self.l_paddle.shapesize(stretch_wid=3, stretch_len=1)
+            self.r_paddle.set_height(3)  # Smaller paddle in Y-axis only
+            self.l_paddle.set_height(3)
+        self.renderer.invalidate(self.r_paddle, self.l_paddle)
+        if self.cpu_opponent is not None:
+            self.cpu_opponent.set_level(self.current_difficulty)
         self.reset_game()
 
+    def toggle_cpu_opponent(self):
+        """Hand the left paddle to a CPU opponent, or give it back to W/S"""
+        if self.cpu_opponent is None:
+            self.cpu_opponent = CPUController(self.match.l_paddle, self.current_difficulty)
+        else:
+            self.cpu_opponent = None
+            self.l_paddle.stop_move()
+        if self.cpu_button is not None:
+            self.cpu_button.config(text="Play vs CPU" if self.cpu_opponent is None else "Two Players")
+        self.setup_keybindings()
+
     def change_background_color(self):
         """Change background color with automatic contrast adjustment"""
+        from tkinter import colorchooser
         color = colorchooser.askcolor(title="Choose Background Color")[1]
         if color:
             self.screen.bgcolor(color)
             # Adjust object colors based on background brightness
             contrast_color = "black" if self.is_light_color(color) else "white"
-            for obj in [self.ball, self.r_paddle, self.l_paddle, self.scoreboard]:
+            for obj in [self.r_paddle, self.l_paddle]:
                 obj.color(contrast_color)
+            self.ball.set_color(contrast_color)
+            if self.powerups is not None:
+                for ball in self.ball_sprites.sprites:
+                    ball.set_color(contrast_color)
+            if self.ball.trail is not None:
+                self.ball.trail.set_background(color)
+            self.scoreboard.set_color(contrast_color)
+            self.renderer.invalidate(self.ball, self.r_paddle, self.l_paddle)
         self.setup_keybindings()  # Re-bind keys after changing the color
 
     @staticmethod
@@ -203,6 +319,8 @@ class PongGame:
 
     def open_controls(self, x, y):
         """Show the control window"""
+        if self.root is None:
+            self.setup_controls()
         self.root.deiconify()
         self.root.lift()  # Bring window to front
         self.root.focus_force()  # Force focus on window
@@ -217,40 +335,115 @@ class PongGame:
     def check_win_condition(self):
         """Check if either player has won"""
         if max(self.scoreboard.l_score, self.scoreboard.r_score) >= self.winning_score:
+            from tkinter import messagebox
             winner = "Left" if self.scoreboard.l_score > self.scoreboard.r_score else "Right"
+            if self.recorder is not None:
+                self.recorder.save(self.record_path)
             messagebox.showinfo("Game Over", f"{winner} player wins!")
             self.game_active = False
             return True
         return False
 
+    def sync_powerups(self):
+        """Show sprites for the pickups and extra balls in play, and the trail while it is on"""
+        self.pickup_sprites.follow(self.powerups.pickups)
+        self.ball_sprites.follow(self.match.balls[1:])
+        if self.ball.trail_effect != self.powerups.trail_active:
+            self.ball.toggle_trail()
+
+    def open_score_store(self):
+        """Open the score database and load the high score, once the first frame is on screen"""
+        self.scoreboard.attach_store(ScoreStore())
+
+    def shutdown(self):
+        """Flush and release everything that outlives the window; called even after a crash"""
+        if self.feed is not None:
+            self.feed.close()  # Unlink the shared memory block
+        if self.events is not None:
+            self.events.close()  # Write the queued events; the writer is a daemon thread
+        if self.scoreboard.store is not None:
+            self.scoreboard.store.close()  # Finish writing queued match results
+        if self.profiler is not None:
+            self.profiler.save_trace()
+
     def game_loop(self):
-        """Main game loop"""
+        """Main game loop: fixed-rate physics ticks, one interpolated render per frame"""
+        now = time.perf_counter()
+        profiler = self.profiler
         if not self.is_paused and self.game_active:
-            time.sleep(self.ball.move_speed)
-            self.screen.update()
-            self.ball.move()
-
-            # Boundary collisions
-            if self.ball.ycor() > self.UPPER_BOUNDARY or self.ball.ycor() < self.LOWER_BOUNDARY:
-                self.ball.bounce_y()
-
-            # Paddle collisions
-            if ((self.ball.distance(self.r_paddle) < 50 and self.ball.xcor() > 330) or
-                    (self.ball.distance(self.l_paddle) < 50 and self.ball.xcor() < -330)):
-                self.ball.bounce_x()
-
-            # Scoring
-            if self.ball.xcor() > self.RIGHT_BOUNDARY:
-                self.ball.reset_position()
-                self.scoreboard.l_point()
-                self.check_win_condition()
-            elif self.ball.xcor() < self.LEFT_BOUNDARY:
-                self.ball.reset_position()
-                self.scoreboard.r_point()
-                self.check_win_condition()
-
-        self.screen.ontimer(self.game_loop, 20)
+            if profiler is not None:
+                profiler.frame_start()
+            clock = time.perf_counter_ns
+            for _ in range(self.clock.advance(now)):
+                if profiler is not None:
+                    t0 = clock()
+                self.r_player.tick(self.match)
+                (self.cpu_opponent or self.l_player).tick(self.match)
+                if self.recorder is not None:
+                    self.recorder.record()
+                if profiler is None:
+                    scorer = self.match.step(self.clock.dt)
+                else:
+                    profiler.span("input", t0, clock())
+                    scorer = profiler.step_match(self.match, self.clock.dt)
+                if self.powerups is not None:
+                    self.powerups.step(self.clock.dt)
+                if self.feed is not None:
+                    self.feed.publish(self.match)
+
+                # Scoring
+                if scorer is not None:
+                    if profiler is not None:
+                        t0 = clock()
+                    if self.ball.trail_effect:
+                        self.ball.clear_trail()
+                    self.scoreboard.refresh()
+                    if profiler is not None:
+                        profiler.span("scoreboard", t0, clock())
+                    if self.check_win_condition():
+                        break
+
+            # One render pass after the physics, touching only what changed
+            if profiler is not None:
+                t0 = clock()
+            if self.powerups is not None:
+                self.sync_powerups()
+            self.renderer.render(self.clock.alpha)
+            if profiler is not None:
+                profiler.span("render", t0, clock())
+                profiler.frame_end()
+            if self.startup is not None:
+                self.startup.mark("first frame")
+                print(self.startup.report())
+                self.startup = None
+        else:
+            self.clock.reset(now)
+
+        self.screen.ontimer(self.game_loop, self.FRAME_INTERVAL_MS)
 
 if __name__ == "__main__":
-    game = PongGame()
-    game.root.mainloop()
+    parser = argparse.ArgumentParser(description="Pong Game - Enhanced Edition")
+    parser.add_argument("--record", metavar="PATH",
+                        help="save this match's inputs for replay.py when a player wins")
+    parser.add_argument("--profile", action="store_true",
+                        help="show a live frame-time overlay")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="profile and write a Chrome trace JSON file on exit")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print how long each startup phase took, up to the first frame")
+    parser.add_argument("--feed", metavar="NAME", nargs="?", const="pong_state",
+                        help="publish every tick's state to shared memory for state_feed.py readers")
+    parser.add_argument("--powerups", action="store_true",
+                        help="spawn power-up pickups on the field")
+    parser.add_argument("--events", metavar="PATH",
+                        help="log every hit, wall bounce, point and reset for events.py summarize")
+    args = parser.parse_args()
+    if args.record and args.powerups:
+        parser.error("--record does not support --powerups")
+    game = PongGame(record_path=args.record, profile=args.profile, trace_path=args.trace,
+                    startup_profile=args.startup_profile, powerups=args.powerups,
+                    feed_name=args.feed, events_path=args.events)
+    try:
+        game.screen.mainloop()
+    finally:
+        game.shutdown()
@@ -0,0 +1,264 @@
+from typing import Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from engine import Match
+from controllers import CPUController
+import argparse
+import asyncio
+import os
+import time
+
+TICK_HZ = 120
+TICKS_PER_BATCH = 12  # Each shard advances its matches 100 ms at a time
+MAX_CATCH_UP = 4  # A late shard may run at most this many batches at once
+BEHIND_LIMIT = 0.25  # Seconds of lag before a shard stops taking new matches
+
+
+def game_seed(seed: int, match_id: int, game: int) -> int:
+    """
+    Seed of one game of a hosted match
+
+    Game 0 of match n uses seed + n, and later games put the game number in
+    the upper 32 bits, so no two games of any matches share a seed.
+    """
+    return seed + (game << 32 | match_id)
+
+
+class _HostedMatch:
+    """Worker side: one match, its players and its tick timings"""
+
+    __slots__ = ("match", "players", "seed", "match_id", "games", "tick_ns", "worst_tick_ns")
+
+    def __init__(self, match_id: int, seed: int):
+        self.match_id = match_id
+        self.seed = seed
+        self.games = 0
+        self.match = Match(seed=game_seed(seed, match_id, 0))
+        self.players = (
+            CPUController(self.match.l_paddle, "default", rng=self.match.rng, budget_us=10 ** 6),
+            CPUController(self.match.r_paddle, "hard", rng=self.match.rng, budget_us=10 ** 6),
+        )
+        self.tick_ns = 0
+        self.worst_tick_ns = 0
+
+    def next_game(self) -> None:
+        self.games += 1
+        self.match.reset(game_seed(self.seed, self.match_id, self.games))
+        for player in self.players:
+            player.reset()
+
+
+# Matches hosted by the current worker process, keyed by match id. Each shard
+# is a single-worker pool, so this state stays with its shard between calls.
+_matches: Dict[int, _HostedMatch] = {}
+
+
+def _open_matches(match_ids: List[int], seed: int) -> int:
+    """Worker side: create a CPU-vs-CPU match for each id"""
+    for match_id in match_ids:
+        _matches[match_id] = _HostedMatch(match_id, seed)
+    return len(_matches)
+
+
+def _close_matches(match_ids: List[int]) -> int:
+    """Worker side: drop matches"""
+    for match_id in match_ids:
+        _matches.pop(match_id, None)
+    return len(_matches)
+
+
+def _advance(ticks: int, dt: float) -> dict:
+    """
+    Worker side: step every hosted match
+
+    Returns:
+        Shard elapsed seconds, finished match count and per-match tick times
+    """
+    clock = time.perf_counter_ns
+    start = clock()
+    finished = 0
+    for hosted in _matches.values():
+        match, players = hosted.match, hosted.players
+        for _ in range(ticks):
+            t0 = clock()
+            for player in players:
+                player.tick(match)
+            match.step(dt)
+            elapsed = clock() - t0
+            hosted.tick_ns += elapsed
+            if elapsed > hosted.worst_tick_ns:
+                hosted.worst_tick_ns = elapsed
+            if not match.score.game_active:
+                finished += 1
+                hosted.next_game()
+    return {
+        "elapsed": (clock() - start) / 1e9,
+        "finished": finished,
+        "ticks": {match_id: (hosted.match.tick, hosted.tick_ns, hosted.worst_tick_ns)
+                  for match_id, hosted in _matches.items()},
+    }
+
+
+class Shard:
+    """
+    One worker process hosting a group of matches
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.pool = ProcessPoolExecutor(max_workers=1)
+        self.match_ids: List[int] = []
+        self.lag = 0.0  # Seconds of simulated time still owed to real time
+        self.busy_seconds = 0.0
+        self.batches = 0
+        self.finished = 0
+        self.tick_stats: Dict[int, tuple] = {}
+
+    @property
+    def accepting(self) -> bool:
+        """Whether the shard keeps up well enough to take more matches"""
+        return self.lag < BEHIND_LIMIT
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(cancel_futures=True)
+
+
+class MatchServer:
+    """
+    Hosts many headless matches on an asyncio loop, sharded across processes
+
+    Every shard advances its matches in batches of TICKS_PER_BATCH ticks on a
+    real-time schedule. A shard that falls behind runs catch-up batches and
+    stops accepting new matches until it recovers.
+    """
+
+    def __init__(self, shards: Optional[int] = None, hz: int = TICK_HZ, seed: int = 0):
+        """
+        Initialize the server
+
+        Args:
+            shards: Worker processes to use (default: one per CPU core)
+            hz: Physics ticks per second for every match (default: 120)
+            seed: Base seed; see game_seed for each game's seed (default: 0)
+        """
+        self.dt = 1.0 / hz
+        self.seed = seed
+        self.shards = [Shard(index) for index in range(shards or os.cpu_count() or 1)]
+        self.next_match_id = 0
+        self.rejected = 0
+        self._running = False
+
+    async def add_matches(self, count: int) -> int:
+        """
+        Open matches on the least loaded shards that are keeping up
+
+        Returns:
+            Number of matches actually opened; the rest were refused
+        """
+        loop = asyncio.get_running_loop()
+        candidates = [shard for shard in self.shards if shard.accepting]
+        if not candidates:
+            self.rejected += count
+            return 0
+        # Deal the new ids out to the least loaded shards, then open each
+        # shard's share in a single call, all shards at once
+        planned = {shard: [] for shard in candidates}
+        for _ in range(count):
+            shard = min(candidates,
+                        key=lambda candidate: len(candidate.match_ids) + len(planned[candidate]))
+            planned[shard].append(self.next_match_id)
+            self.next_match_id += 1
+        await asyncio.gather(*(loop.run_in_executor(shard.pool, _open_matches, match_ids, self.seed)
+                               for shard, match_ids in planned.items() if match_ids))
+        for shard, match_ids in planned.items():
+            shard.match_ids.extend(match_ids)
+        return count
+
+    async def _run_shard(self, shard: Shard) -> None:
+        loop = asyncio.get_running_loop()
+        batch_time = TICKS_PER_BATCH * self.dt
+        next_due = loop.time()
+        while self._running:
+            now = loop.time()
+            if now < next_due:
+                await asyncio.sleep(next_due - now)
+                continue
+            # Catch up on missed batches in one call, up to a limit
+            owed = min(MAX_CATCH_UP, 1 + int((loop.time() - next_due) / batch_time))
+            result = await loop.run_in_executor(
+                shard.pool, _advance, TICKS_PER_BATCH * owed, self.dt)
+            next_due += owed * batch_time
+            shard.lag = max(0.0, loop.time() - next_due)
+            shard.busy_seconds += result["elapsed"]
+            shard.batches += owed
+            shard.finished += result["finished"]
+            shard.tick_stats = result["ticks"]
+
+    async def run(self, seconds: float) -> dict:
+        """Run every shard for a wall-clock duration and return metrics"""
+        self._running = True
+        tasks = [asyncio.create_task(self._run_shard(shard)) for shard in self.shards]
+        await asyncio.sleep(seconds)
+        self._running = False
+        await asyncio.gather(*tasks)
+        return self.metrics(seconds)
+
+    def metrics(self, seconds: float) -> dict:
+        """Per-shard load and per-match tick times, plus matches per core"""
+        shards = []
+        for shard in self.shards:
+            utilisation = shard.busy_seconds / seconds if seconds else 0.0
+            matches = len(shard.match_ids)
+            tick_us = [total / ticks / 1000 for ticks, total, _ in shard.tick_stats.values() if ticks]
+            shards.append({
+                "shard": shard.index,
+                "matches": matches,
+                "utilisation": round(utilisation, 3),
+                "lag_seconds": round(shard.lag, 3),
+                "accepting": shard.accepting,
+                "finished_matches": shard.finished,
+                "mean_tick_us": round(sum(tick_us) / len(tick_us), 2) if tick_us else None,
+                "worst_tick_us": round(max((worst for _, _, worst in shard.tick_stats.values()),
+                                           default=0) / 1000, 2),
+                # Matches this core could host in real time at the measured cost
+                "capacity": int(matches / utilisation) if utilisation else None,
+            })
+        capacities = [shard["capacity"] for shard in shards if shard["capacity"]]
+        return {
+            "shards": shards,
+            "rejected_matches": self.rejected,
+            "matches_per_core": int(sum(capacities) / len(capacities)) if capacities else None,
+        }
+
+    def shutdown(self) -> None:
+        for shard in self.shards:
+            shard.shutdown()
+
+
+async def _serve(args: argparse.Namespace) -> dict:
+    server = MatchServer(args.shards, args.hz, args.seed)
+    try:
+        opened = await server.add_matches(args.matches)
+        print(f"Hosting {opened} matches on {len(server.shards)} shards")
+        return await server.run(args.seconds)
+    finally:
+        server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Host many headless Pong matches")
+    parser.add_argument("--shards", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--matches", type=int, default=64, help="matches to open")
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long to run")
+    parser.add_argument("--hz", type=int, default=TICK_HZ)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    metrics = asyncio.run(_serve(args))
+    for shard in metrics["shards"]:
+        print(shard)
+    print(f"Rejected {metrics['rejected_matches']} matches; "
+          f"about {metrics['matches_per_core']} matches per core in real time")
+
+
+if __name__ == "__main__":
+    main()
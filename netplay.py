@@ -0,0 +1,432 @@
+from typing import Dict, Optional, Tuple
+from collections import deque
+from engine import Match, PaddleState
+from timestep import FixedTimestep
+import argparse
+import selectors
+import socket
+import struct
+import time
+
+DEFAULT_PORT = 5005
+TICK_HZ = 60
+SNAPSHOT_EVERY = 2  # Ticks between snapshots: 30 snapshots a second
+HISTORY = 64  # Snapshots kept per client as possible delta bases
+CLIENT_TIMEOUT = 5.0
+INTERP_DELAY = 0.1  # Clients render remote objects this far in the past
+RESTART_DELAY = 3.0
+
+JOIN, INPUT, WELCOME, SNAPSHOT, FULL = range(1, 6)
+SIDES = ("left", "right")
+
+# Client -> server: type, input sequence, paddle direction, last snapshot received
+INPUT_PACKET = struct.Struct("<BIbI")
+# Server -> client: type, side index (or FULL), tick rate
+WELCOME_PACKET = struct.Struct("<BBH")
+# Server -> client: type, snapshot sequence, delta base (0 = none), last input applied, field mask
+SNAPSHOT_HEADER = struct.Struct("<BIIIB")
+
+SNAPSHOT_FIELDS = ("ball_x", "ball_y", "x_move", "y_move", "l_y", "r_y", "l_score", "r_score")
+FIELD_FORMATS = "ffffffHH"
+FIELD_STRUCTS = [struct.Struct("<" + code) for code in FIELD_FORMATS]
+QUANTIZE = struct.Struct("<" + FIELD_FORMATS)
+
+Snapshot = Tuple[float, float, float, float, float, float, int, int]
+
+
+def capture(match: Match) -> Snapshot:
+    """Match state as sent on the wire, rounded to its float32 encoding"""
+    ball = match.ball
+    return QUANTIZE.unpack(QUANTIZE.pack(
+        ball.x, ball.y, ball.x_move, ball.y_move, match.l_paddle.y, match.r_paddle.y,
+        match.score.l_score, match.score.r_score
+    ))
+
+
+def encode_snapshot(seq: int, base_seq: int, base: Optional[Snapshot], state: Snapshot,
+                    input_ack: int) -> bytes:
+    """Pack only the fields of state that differ from base (all of them without a base)"""
+    mask = 0
+    body = []
+    for index, value in enumerate(state):
+        if base is None or base[index] != value:
+            mask |= 1 << index
+            body.append(FIELD_STRUCTS[index].pack(value))
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT, seq, base_seq if base is not None else 0, input_ack, mask)
+    return header + b"".join(body)
+
+
+def decode_snapshot(packet: bytes, bases: Dict[int, Snapshot]) -> Optional[Tuple[int, int, Snapshot]]:
+    """
+    Rebuild a full snapshot from a delta packet
+
+    Returns:
+        (snapshot sequence, last input applied, snapshot), or None if the
+        delta base is no longer known
+    """
+    _, seq, base_seq, input_ack, mask = SNAPSHOT_HEADER.unpack_from(packet)
+    if base_seq:
+        base = bases.get(base_seq)
+        if base is None:
+            return None
+        values = list(base)
+    else:
+        values = [0] * len(SNAPSHOT_FIELDS)
+    offset = SNAPSHOT_HEADER.size
+    for index, field in enumerate(FIELD_STRUCTS):
+        if mask & 1 << index:
+            values[index] = field.unpack_from(packet, offset)[0]
+            offset += field.size
+    return seq, input_ack, tuple(values)
+
+
+class _RemoteClient:
+    __slots__ = ("address", "side", "last_input", "acked", "history", "last_heard")
+
+    def __init__(self, address: Tuple[str, int], side: int):
+        self.address = address
+        self.side = side
+        self.last_input = 0
+        self.acked = 0
+        self.history: Dict[int, Snapshot] = {}
+        self.last_heard = time.monotonic()
+
+
+class NetServer:
+    """
+    Authoritative UDP server for one networked match
+
+    Clients only send paddle directions; the server runs the physics and
+    streams delta-compressed snapshots back.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, hz: int = TICK_HZ,
+                 seed: Optional[int] = None):
+        """
+        Initialize the server socket and match
+
+        Args:
+            host: Address to bind (default: loopback)
+            port: UDP port to bind; 0 picks a free one (default: 5005)
+            hz: Physics ticks per second (default: 60)
+            seed: Seed for the match (default: random)
+        """
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.clock = FixedTimestep(hz)
+        self.match = Match(seed=seed)
+        self.clients: Dict[Tuple[str, int], _RemoteClient] = {}
+        self.ticks = 0
+        self.snapshot_seq = 0
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self._game_over_at: Optional[float] = None
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def _paddle(self, side: int) -> PaddleState:
+        return self.match.l_paddle if side == 0 else self.match.r_paddle
+
+    def _send(self, packet: bytes, address: Tuple[str, int]) -> None:
+        self.sock.sendto(packet, address)
+        self.bytes_sent += len(packet)
+        self.packets_sent += 1
+
+    def poll(self) -> None:
+        """Handle every datagram waiting on the socket"""
+        while True:
+            try:
+                packet, address = self.sock.recvfrom(512)
+            except BlockingIOError:
+                break
+            except ConnectionResetError:
+                continue
+            if not packet:
+                continue
+            if packet[0] == JOIN:
+                self._handle_join(address)
+            elif packet[0] == INPUT and len(packet) == INPUT_PACKET.size:
+                self._handle_input(packet, address)
+
+        now = time.monotonic()
+        for address, client in list(self.clients.items()):
+            if now - client.last_heard > CLIENT_TIMEOUT:
+                self._paddle(client.side).stop_move()
+                del self.clients[address]
+
+    def _handle_join(self, address: Tuple[str, int]) -> None:
+        client = self.clients.get(address)
+        if client is None:
+            taken = {other.side for other in self.clients.values()}
+            free = [side for side in (0, 1) if side not in taken]
+            if not free:
+                self._send(WELCOME_PACKET.pack(WELCOME, FULL, self.clock.hz), address)
+                return
+            client = self.clients[address] = _RemoteClient(address, free[0])
+        self._send(WELCOME_PACKET.pack(WELCOME, client.side, self.clock.hz), address)
+
+    def _handle_input(self, packet: bytes, address: Tuple[str, int]) -> None:
+        client = self.clients.get(address)
+        if client is None:
+            return
+        _, input_seq, direction, acked = INPUT_PACKET.unpack(packet)
+        client.last_heard = time.monotonic()
+        client.acked = max(client.acked, acked)
+        if input_seq <= client.last_input:
+            return  # Late or duplicate
+        client.last_input = input_seq
+        paddle = self._paddle(client.side)
+        if direction:
+            paddle.start_move(max(-1, min(1, direction)))
+        else:
+            paddle.stop_move()
+
+    def tick(self) -> None:
+        """Advance the match one tick and send snapshots when due"""
+        match = self.match
+        self.ticks += 1
+        if match.score.game_active:
+            match.step(self.clock.dt)
+        elif self._game_over_at is None:
+            self._game_over_at = time.monotonic()
+        elif time.monotonic() - self._game_over_at > RESTART_DELAY:
+            match.reset()
+            self._game_over_at = None
+        if self.ticks % SNAPSHOT_EVERY == 0:
+            self.broadcast()
+
+    def broadcast(self) -> None:
+        """Send each client the current state, delta-encoded against its last ack"""
+        self.snapshot_seq += 1
+        seq = self.snapshot_seq
+        state = capture(self.match)
+        for client in self.clients.values():
+            base = client.history.get(client.acked)
+            self._send(encode_snapshot(seq, client.acked, base, state, client.last_input),
+                       client.address)
+            client.history[seq] = state
+            client.history.pop(seq - HISTORY, None)
+
+    def serve_forever(self) -> None:
+        """Run the fixed-rate server loop until interrupted"""
+        selector = selectors.DefaultSelector()
+        selector.register(self.sock, selectors.EVENT_READ)
+        self.clock.reset(time.perf_counter())
+        while True:
+            timeout = max(0.0, self.clock.dt - self.clock.accumulator)
+            selector.select(timeout)
+            self.poll()
+            for _ in range(self.clock.advance(time.perf_counter())):
+                self.tick()
+
+
+class NetClient:
+    """
+    UDP client: predicts its own paddle and interpolates everything else
+    """
+
+    def __init__(self, server: Tuple[str, int], timeout: float = 2.0):
+        """
+        Join a server
+
+        Args:
+            server: (host, port) of a NetServer
+            timeout: Seconds to wait for the welcome reply (default: 2.0)
+
+        Raises:
+            ConnectionError: If the server does not answer or is full
+        """
+        self.server = server
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.settimeout(timeout)
+        self.sock.sendto(bytes([JOIN]), server)
+        try:
+            while True:
+                packet, _ = self.sock.recvfrom(512)
+                if packet[0] == WELCOME:
+                    break
+        except socket.timeout:
+            raise ConnectionError(f"No answer from Pong server at {server[0]}:{server[1]}")
+        _, side, hz = WELCOME_PACKET.unpack(packet)
+        if side == FULL:
+            raise ConnectionError("Pong server already has two players")
+        self.sock.setblocking(False)
+
+        self.side = side
+        self.dt = 1.0 / hz
+        self.match = Match()  # Local copy used for prediction and rendering
+        self.paddle = self.match.l_paddle if side == 0 else self.match.r_paddle
+        self.input_seq = 0
+        self.pending: deque = deque()  # (input sequence, direction) not yet applied by the server
+        self.snapshots: Dict[int, Snapshot] = {}
+        self.latest_seq = 0
+        self.buffer: deque = deque(maxlen=32)  # (arrival time, snapshot) for interpolation
+        self.bytes_received = 0
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def send_input(self, direction: int) -> None:
+        """Send this tick's direction and apply it to the local paddle straight away"""
+        self.input_seq += 1
+        self.sock.sendto(INPUT_PACKET.pack(INPUT, self.input_seq, direction, self.latest_seq),
+                         self.server)
+        self.pending.append((self.input_seq, direction))
+        self._apply(direction)
+
+    def _apply(self, direction: int) -> None:
+        if direction:
+            self.paddle.start_move(direction)
+        else:
+            self.paddle.stop_move()
+        self.paddle.update(self.dt / Match.PADDLE_STEP_TIME)
+
+    def poll(self) -> None:
+        """Read every waiting snapshot and reconcile the predicted paddle"""
+        while True:
+            try:
+                packet, _ = self.sock.recvfrom(512)
+            except (BlockingIOError, ConnectionResetError):
+                break
+            self.bytes_received += len(packet)
+            if packet and packet[0] == SNAPSHOT:
+                self._receive(packet)
+
+    def _receive(self, packet: bytes) -> None:
+        decoded = decode_snapshot(packet, self.snapshots)
+        if decoded is None:
+            return
+        seq, input_ack, state = decoded
+        self.snapshots[seq] = state
+        self.snapshots.pop(seq - HISTORY, None)
+        if seq <= self.latest_seq:
+            return  # Out of order: keep it as a delta base only
+        self.latest_seq = seq
+        self.buffer.append((time.monotonic(), state))
+
+        score = self.match.score
+        score.l_score, score.r_score = state[6], state[7]
+
+        # Server-side paddle position, then replay the inputs it has not seen yet
+        self.paddle.y = state[4] if self.side == 0 else state[5]
+        while self.pending and self.pending[0][0] <= input_ack:
+            self.pending.popleft()
+        for _, direction in self.pending:
+            self._apply(direction)
+
+    def interpolate(self, now: Optional[float] = None) -> None:
+        """Place the ball and opponent paddle INTERP_DELAY seconds in the past"""
+        if not self.buffer:
+            return
+        render_time = (now if now is not None else time.monotonic()) - INTERP_DELAY
+        older, newer = self.buffer[0], self.buffer[-1]
+        for index in range(len(self.buffer) - 1, 0, -1):
+            if self.buffer[index - 1][0] <= render_time:
+                older, newer = self.buffer[index - 1], self.buffer[index]
+                break
+        span = newer[0] - older[0]
+        alpha = 0.0 if span <= 0 else min(1.0, max(0.0, (render_time - older[0]) / span))
+        a, b = older[1], newer[1]
+
+        ball = self.match.ball
+        if abs(b[0] - a[0]) > Match.SCREEN_WIDTH / 2:
+            ball.x, ball.y = b[0], b[1]  # A serve, not movement: don't smear it
+        else:
+            ball.x = a[0] + (b[0] - a[0]) * alpha
+            ball.y = a[1] + (b[1] - a[1]) * alpha
+        if (ball.x_move, ball.y_move) != (b[2], b[3]):
+            ball.x_move, ball.y_move = b[2], b[3]
+            ball.bounces += 1  # New straight-line path for trajectory prediction
+        ball.prev_x, ball.prev_y = ball.x, ball.y
+
+        opponent = self.match.r_paddle if self.side == 0 else self.match.l_paddle
+        index = 5 if self.side == 0 else 4
+        opponent.y = a[index] + (b[index] - a[index]) * alpha
+
+
+def run_client(host: str, port: int, bot: bool = False) -> None:
+    """Play against a server, with the turtle window or as a headless CPU bot"""
+    client = NetClient((host, port))
+    print(f"Joined {host}:{port} as the {SIDES[client.side]} player")
+    clock = FixedTimestep(1.0 / client.dt)
+
+    if bot:
+        from controllers import CPUController
+        player = CPUController(client.paddle, "hard")
+        clock.reset(time.perf_counter())
+        try:
+            while True:
+                time.sleep(client.dt / 2)
+                client.poll()
+                for _ in range(clock.advance(time.perf_counter())):
+                    client.interpolate()
+                    player.tick(client.match)
+                    client.send_input(client.paddle.direction)
+        except KeyboardInterrupt:
+            print(f"Received {client.bytes_received} bytes")
+        return
+
+    from turtle import Screen
+    from ball import Ball
+    from paddle import Paddle
+    from scoreboard import Scoreboard
+    from keyboard import KeyboardInput
+    from renderer import Renderer
+
+    screen = Screen()
+    screen.setup(width=Match.SCREEN_WIDTH, height=Match.SCREEN_HEIGHT)
+    screen.title(f"PONG GAME - {SIDES[client.side].upper()} PLAYER")
+    screen.bgcolor("black")
+    screen.tracer(0)
+    match = client.match
+    sprites = [
+        Ball(state=match.ball),
+        Paddle(Match.R_PADDLE_POSITION, state=match.r_paddle),
+        Paddle(Match.L_PADDLE_POSITION, state=match.l_paddle),
+    ]
+    scoreboard = Scoreboard(state=match.score)
+    renderer = Renderer(screen)
+    renderer.add(*sprites)
+    keyboard = KeyboardInput(screen, ("Up", "Down"))
+    screen.listen()
+    keyboard.install()
+
+    def frame() -> None:
+        client.poll()
+        for _ in range(clock.advance(time.perf_counter())):
+            client.send_input(keyboard.is_held("Up") - keyboard.is_held("Down"))
+        client.interpolate()
+        scoreboard.update_scoreboard()
+        renderer.render()
+        screen.ontimer(frame, 16)
+
+    frame()
+    screen.mainloop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Networked two-player Pong over UDP")
+    parser.add_argument("mode", choices=("server", "client"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--bot", action="store_true", help="client plays as a headless CPU")
+    args = parser.parse_args()
+
+    if args.mode == "server":
+        server = NetServer(args.host, args.port)
+        print(f"Serving Pong on {server.address[0]}:{server.address[1]}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"Sent {server.packets_sent} packets, {server.bytes_sent} bytes")
+        finally:
+            server.close()
+    else:
+        run_client(args.host, args.port, args.bot)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,26 @@
 from turtle import Turtle
 from typing import Tuple, Optional
+from engine import PaddleState
 
 
 class Paddle(Turtle):
     """
-    A paddle class for the Pong game that handles paddle movement and appearance
+    A paddle class for the Pong game that renders a PaddleState
     """
 
     DEFAULT_COLOR = "white"
-    DEFAULT_MOVE_INCREMENT = 20
-    DEFAULT_SIZE = (5, 1)  # (height, width)
-    UPPER_BOUNDARY = 250
-    LOWER_BOUNDARY = -250
+    DEFAULT_MOVE_INCREMENT = PaddleState.DEFAULT_MOVE_INCREMENT
+    DEFAULT_SIZE = PaddleState.DEFAULT_SIZE  # (height, width)
+    UPPER_BOUNDARY = PaddleState.UPPER_BOUNDARY
+    LOWER_BOUNDARY = PaddleState.LOWER_BOUNDARY
 
     def __init__(
             self,
             position: Tuple[int, int],
             color: str = DEFAULT_COLOR,
             move_increment: int = DEFAULT_MOVE_INCREMENT,
-            size: Optional[Tuple[int, int]] = None
+            size: Optional[Tuple[int, int]] = None,
+            state: Optional[PaddleState] = None
     ):
         """
         Initialize a new paddle
@@ -28,51 +30,66 @@ class Paddle(Turtle):
             color: Color of the paddle (default: white)
             move_increment: Movement speed in pixels (default: 20)
             size: Optional tuple of (height, width) for paddle size
+            state: Existing simulation state to render (default: a new PaddleState)
         """
         super().__init__()
-        self.size = size or self.DEFAULT_SIZE
-        self._setup_paddle(position, color)
-        self.move_increment = move_increment
-        self.moving = False  # For smooth continuous movement
-        self.direction = 0  # Current movement direction (-1, 0, or 1)
+        self.state = state or PaddleState(position, move_increment, size)
+        self._setup_paddle(color)
 
-    def _setup_paddle(self, position: Tuple[int, int], color: str) -> None:
+    def _setup_paddle(self, color: str) -> None:
         """Set up the initial paddle appearance and position"""
         self.shape("square")
         self.color(color)
-        self.shapesize(stretch_wid=self.size[0], stretch_len=self.size[1])
         self.penup()
-        self.goto(position)
+        self.sync()
+
+    @property
+    def size(self) -> Tuple[float, float]:
+        return self.state.size
+
+    def sync(self, alpha: float = 1.0) -> bool:
+        """
+        Match the turtle's position and size to the simulation state
+
+        Args:
+            alpha: Blend between the previous (0.0) and current (1.0) tick
+
+        Returns:
+            True if anything changed and the paddle needs redrawing
+        """
+        changed = False
+        height, width = self.state.size
+        if self.shapesize()[:2] != (height, width):
+            self.shapesize(stretch_wid=height, stretch_len=width)
+            changed = True
+        position = (self.state.x, self.state.interpolate_y(alpha))
+        if self.position() != position:
+            self.goto(position)
+            changed = True
+        return changed
 
     def go_up(self) -> None:
         """Move the paddle up if within bounds"""
-        if self.ycor() < self.UPPER_BOUNDARY:
-            new_y = self.ycor() + self.move_increment
-            self.goto(self.xcor(), min(new_y, self.UPPER_BOUNDARY))
+        self.state.go_up()
+        self.sync()
 
     def go_down(self) -> None:
         """Move the paddle down if within bounds"""
-        if self.ycor() > self.LOWER_BOUNDARY:
-            new_y = self.ycor() - self.move_increment
-            self.goto(self.xcor(), max(new_y, self.LOWER_BOUNDARY))
+        self.state.go_down()
+        self.sync()
 
     def start_move(self, direction: int) -> None:
         """Start continuous movement in the specified direction"""
-        self.moving = True
-        self.direction = direction
+        self.state.start_move(direction)
 
     def stop_move(self) -> None:
         """Stop continuous movement"""
-        self.moving = False
-        self.direction = 0
+        self.state.stop_move()
 
     def update(self) -> None:
         """Update paddle position for continuous movement"""
-        if self.moving:
-            if self.direction > 0:
-                self.go_up()
-            elif self.direction < 0:
-                self.go_down()
+        self.state.update()
+        self.sync()
 
     def stretch_y(self, factor: float) -> None:
         """
@@ -81,14 +98,18 @@ class Paddle(Turtle):
         Args:
             factor: Multiplication factor for paddle height
         """
-        new_height = self.size[0] * factor
-        self.size = (new_height, self.size[1])
-        self.shapesize(stretch_wid=new_height, stretch_len=self.size[1])
+        self.state.stretch_y(factor)
+        self.sync()
+
+    def set_height(self, height: float) -> None:
+        """Set the paddle height in turtle stretch units"""
+        self.state.size = (height, self.state.size[1])
+        self.sync()
 
     def reset_size(self) -> None:
         """Reset paddle to default size"""
-        self.size = self.DEFAULT_SIZE
-        self.shapesize(stretch_wid=self.size[0], stretch_len=self.size[1])
+        self.state.reset_size()
+        self.sync()
 
     def get_edges(self) -> Tuple[float, float, float, float]:
         """
@@ -97,11 +118,4 @@ class Paddle(Turtle):
         Returns:
             Tuple of (left, right, top, bottom) edge coordinates
         """
-        half_width = self.size[1] * 10  # 10 is default turtle size
-        half_height = self.size[0] * 10
-        return (
-            self.xcor() - half_width,
-            self.xcor() + half_width,
-            self.ycor() + half_height,
-            self.ycor() - half_height
-        )
\ No newline at end of file
+        return self.state.get_edges()
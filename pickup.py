@@ -0,0 +1,56 @@
+from turtle import Turtle
+from typing import Optional
+from powerups import PickupState
+
+
+class Pickup(Turtle):
+    """
+    A power-up pickup that renders a PickupState, colored by kind
+    """
+
+    COLORS = {
+        "grow": "lime green",
+        "shrink": "red",
+        "speed": "orange",
+        "multiball": "deep sky blue",
+        "trail": "magenta",
+    }
+    SIZE = 1.2
+
+    def __init__(self, state: Optional[PickupState] = None):
+        """
+        Initialize a new pickup
+
+        Args:
+            state: Pickup state to render (default: a new PickupState)
+        """
+        super().__init__()
+        self.state = state or PickupState()
+        self.shape("square")
+        self.shapesize(self.SIZE, self.SIZE)
+        self.setheading(45)  # Diamond, to stand apart from the ball
+        self.penup()
+        self._kind = None
+
+    def sync(self, alpha: float = 1.0) -> bool:
+        """
+        Match the turtle's position and color to the pickup state
+
+        Args:
+            alpha: Unused; pickups do not move between ticks
+
+        Returns:
+            True if anything changed and the pickup needs redrawing
+        """
+        if not self.isvisible():
+            return False
+        changed = False
+        if self._kind != self.state.kind:
+            self._kind = self.state.kind
+            self.color(self.COLORS.get(self._kind, "white"))
+            changed = True
+        position = (self.state.x, self.state.y)
+        if self.position() != position:
+            self.goto(position)
+            changed = True
+        return changed
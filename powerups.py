@@ -0,0 +1,207 @@
+from typing import Callable, Generic, List, Optional, TypeVar
+from engine import BallState, Match
+import random
+
+T = TypeVar("T")
+
+
+class ObjectPool(Generic[T]):
+    """
+    Fixed set of objects created up front and lent out on demand
+
+    acquire() returns None once every object is in use, so a pool also caps
+    how many of a thing can exist at once.
+    """
+
+    def __init__(self, factory: Callable[[], T], size: int):
+        """
+        Create every object of the pool
+
+        Args:
+            factory: Called size times to create the objects
+            size: Number of objects
+        """
+        self.size = size
+        self.free: List[T] = [factory() for _ in range(size)]
+
+    def acquire(self) -> Optional[T]:
+        """Take a free object, or None if all are in use"""
+        return self.free.pop() if self.free else None
+
+    def release(self, item: T) -> None:
+        """Give an object back to the pool"""
+        self.free.append(item)
+
+
+class PickupState:
+    """
+    Display-free power-up waiting on the field to be hit by a ball
+    """
+
+    __slots__ = ("kind", "x", "y")
+
+    def __init__(self):
+        self.kind = ""
+        self.x = 0.0
+        self.y = 0.0
+
+
+class PowerUps:
+    """
+    Spawns pickups on the field and applies their effects to a Match
+
+    A ball that passes over a pickup collects it for the side that last
+    hit that ball. Grow and shrink change a paddle's height for a while,
+    speed makes the ball faster, multiball serves an extra ball from the
+    pickup and trail turns the ball trail on for a while. Pickups and extra
+    balls come from fixed pools, which cap how many can be in play.
+    """
+
+    KINDS = ("grow", "shrink", "speed", "multiball", "trail")
+    SPAWN_INTERVAL = 5.0  # Seconds between spawns
+    EFFECT_DURATION = 8.0  # Seconds a grow, shrink or trail effect lasts
+    MAX_PICKUPS = 3
+    MAX_EXTRA_BALLS = 4
+    PICKUP_RADIUS = 15
+    SPAWN_AREA = (200, 220)  # Pickups appear within +/- these x and y
+    GROW_FACTOR = 1.5
+    SHRINK_FACTOR = 0.6
+    SPEED_FACTOR = 1.3  # Divides move_speed, so the ball covers more ground per tick
+
+    def __init__(self, match: Match, seed: Optional[int] = None):
+        """
+        Initialize the power-up system
+
+        Args:
+            match: Match to spawn pickups in and apply effects to
+            seed: Seed for spawn times, places and kinds (default: derived from
+                the match seed, so the power-ups draw a different stream than the match)
+        """
+        self.match = match
+        self.seed = seed
+        self.rng = random.Random()
+        self.pickups: List[PickupState] = []
+        self.effects: List[list] = []  # [kind, paddle or None, seconds left]
+        self._pickup_pool: ObjectPool[PickupState] = ObjectPool(PickupState, self.MAX_PICKUPS)
+        self._ball_pool: ObjectPool[BallState] = ObjectPool(
+            lambda: BallState(rng=self.rng), self.MAX_EXTRA_BALLS)
+        self._extra_balls: List[BallState] = []
+        self._until_spawn = self.SPAWN_INTERVAL
+        self.rng.seed(self._stream_seed())  # After the pooled balls drew their serves, as in reset()
+
+    def _stream_seed(self):
+        """The explicit seed, or one derived from the match's current seed"""
+        return f"{self.match.seed}:powerups" if self.seed is None else self.seed
+
+    @property
+    def trail_active(self) -> bool:
+        """Whether a trail effect is running"""
+        return any(effect[0] == "trail" for effect in self.effects)
+
+    def reset(self) -> None:
+        """
+        Remove every pickup, extra ball and effect, restoring the paddles
+
+        Call after Match.reset, which may pick a new seed; the generator is
+        reseeded from it in place, so the pooled extra balls follow along.
+        """
+        self.rng.seed(self._stream_seed())
+        for pickup in self.pickups:
+            self._pickup_pool.release(pickup)
+        self.pickups.clear()
+        balls = self.match.balls
+        for ball in self._extra_balls:
+            if ball in balls:
+                balls.remove(ball)
+            self._ball_pool.release(ball)
+        self._extra_balls.clear()
+        for effect in self.effects:
+            self._end_effect(effect)
+        self.effects.clear()
+        self._until_spawn = self.SPAWN_INTERVAL
+
+    def step(self, dt: float) -> Optional[str]:
+        """
+        Advance spawning, collection and effect timers by one physics tick
+
+        Args:
+            dt: Tick length in seconds
+
+        Returns:
+            Kind of the pickup collected this tick, if any
+        """
+        self._return_scored_balls()
+
+        for effect in self.effects:
+            effect[2] -= dt
+            if effect[2] <= 0:
+                self._end_effect(effect)
+        self.effects = [effect for effect in self.effects if effect[2] > 0]
+
+        self._until_spawn -= dt
+        if self._until_spawn <= 0:
+            self._until_spawn = self.SPAWN_INTERVAL
+            self._spawn()
+
+        collected = None
+        if self.pickups:
+            for ball in self.match.balls:
+                reach = ball.radius + self.PICKUP_RADIUS
+                for pickup in self.pickups:
+                    if ball.distance(pickup.x, pickup.y) < reach:
+                        collected = pickup.kind
+                        self.pickups.remove(pickup)
+                        self._pickup_pool.release(pickup)
+                        self._apply(pickup.kind, pickup, ball)
+                        break
+        return collected
+
+    def _spawn(self) -> None:
+        pickup = self._pickup_pool.acquire()
+        if pickup is None:
+            return
+        x_range, y_range = self.SPAWN_AREA
+        pickup.kind = self.rng.choice(self.KINDS)
+        pickup.x = self.rng.uniform(-x_range, x_range)
+        pickup.y = self.rng.uniform(-y_range, y_range)
+        self.pickups.append(pickup)
+
+    def _return_scored_balls(self) -> None:
+        """Release extra balls the match removed after they scored"""
+        if not self._extra_balls:
+            return
+        balls = self.match.balls
+        for ball in [ball for ball in self._extra_balls if ball not in balls]:
+            self._extra_balls.remove(ball)
+            self._ball_pool.release(ball)
+
+    def _apply(self, kind: str, pickup: PickupState, ball: BallState) -> None:
+        # Moving right means the left paddle hit the ball last
+        left_hit = ball.x_move > 0
+        own = self.match.l_paddle if left_hit else self.match.r_paddle
+        other = self.match.r_paddle if left_hit else self.match.l_paddle
+        if kind == "grow":
+            own.stretch_y(self.GROW_FACTOR)
+            self.effects.append([kind, own, self.EFFECT_DURATION])
+        elif kind == "shrink":
+            other.stretch_y(self.SHRINK_FACTOR)
+            self.effects.append([kind, other, self.EFFECT_DURATION])
+        elif kind == "speed":
+            ball.move_speed = max(ball.min_speed, ball.move_speed / self.SPEED_FACTOR)
+        elif kind == "multiball":
+            extra = self._ball_pool.acquire()
+            if extra is not None:
+                extra.reset_position()
+                extra.x = extra.prev_x = pickup.x
+                extra.y = extra.prev_y = pickup.y
+                self.match.add_ball(extra)
+                self._extra_balls.append(extra)
+        elif kind == "trail":
+            self.effects.append([kind, None, self.EFFECT_DURATION])
+
+    def _end_effect(self, effect: list) -> None:
+        kind, paddle = effect[0], effect[1]
+        if kind == "grow":
+            paddle.stretch_y(1 / self.GROW_FACTOR)
+        elif kind == "shrink":
+            paddle.stretch_y(1 / self.SHRINK_FACTOR)
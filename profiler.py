@@ -0,0 +1,136 @@
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+from engine import Match
+import json
+import os
+import time
+
+OVERLAY_FONT = ("Courier", 11, "normal")
+OVERLAY_POSITION = (-390, 285)  # Top-left corner, in turtle coordinates
+OVERLAY_REFRESH = 0.5  # Seconds between overlay updates
+MAX_TRACE_EVENTS = 500_000
+
+
+class FrameProfiler:
+    """
+    Opt-in per-phase timing for the game loop
+
+    The game keeps a profiler of None when profiling is off, so the only
+    cost then is one attribute check per frame and per tick. When on, every
+    phase becomes a Chrome trace "complete" event and its time is added to
+    the current frame's totals.
+    """
+
+    def __init__(self, screen=None, trace_path: Optional[str] = None,
+                 max_events: int = MAX_TRACE_EVENTS):
+        """
+        Initialize the profiler
+
+        Args:
+            screen: Turtle screen to draw the live overlay on (default: none)
+            trace_path: Where save_trace writes the Chrome trace (default: none)
+            max_events: Newest trace events kept in memory (default: 500000)
+        """
+        self.trace_path = trace_path
+        self.events: deque = deque(maxlen=max_events)
+        self.frame_times: deque = deque(maxlen=240)  # ns, for the overlay
+        self.frame_ends: deque = deque(maxlen=240)
+        self.phase_totals: Dict[str, int] = {}
+        self._origin = time.perf_counter_ns()
+        self._frame_start = 0
+        self._phase_start = 0
+        self._pid = os.getpid()
+        self._overlay = None
+        self._overlay_due = 0.0
+        if screen is not None:
+            canvas = screen.getcanvas()
+            x, y = OVERLAY_POSITION
+            self._canvas = canvas
+            self._overlay = canvas.create_text(x * screen.xscale, -y * screen.yscale, text="",
+                                               anchor="nw", fill="yellow", font=OVERLAY_FONT)
+
+    def span(self, name: str, start_ns: int, end_ns: int) -> None:
+        """Record one timed phase"""
+        self.phase_totals[name] = self.phase_totals.get(name, 0) + end_ns - start_ns
+        self.events.append((name, start_ns, end_ns))
+
+    def frame_start(self) -> None:
+        self._frame_start = time.perf_counter_ns()
+        self.phase_totals.clear()
+
+    def frame_end(self) -> None:
+        end = time.perf_counter_ns()
+        self.span("frame", self._frame_start, end)
+        self.frame_times.append(end - self._frame_start)
+        self.frame_ends.append(end)
+        if self._overlay is not None and time.monotonic() >= self._overlay_due:
+            self._overlay_due = time.monotonic() + OVERLAY_REFRESH
+            self._canvas.itemconfigure(self._overlay, text=self.summary())
+
+    def step_match(self, match: Match, dt: Optional[float]) -> Optional[str]:
+        """Match.step with each of its phases timed"""
+        self._phase_start = time.perf_counter_ns()
+        return match.step(dt, self._end_phase)
+
+    def _end_phase(self, name: str) -> None:
+        end = time.perf_counter_ns()
+        self.span(name, self._phase_start, end)
+        self._phase_start = end
+
+    def summary(self) -> str:
+        """Overlay text: frame rate, frame time percentiles and the last frame's phases"""
+        if len(self.frame_times) < 2:
+            return ""
+        ordered = sorted(self.frame_times)
+        last = len(ordered) - 1
+        window = (self.frame_ends[-1] - self.frame_ends[0]) / 1e9
+        fps = (len(self.frame_ends) - 1) / window if window > 0 else 0.0
+        lines = [
+            f"{fps:5.1f} fps  frame p50 {ordered[last // 2] / 1e6:.2f}ms"
+            f"  p99 {ordered[int(last * 0.99)] / 1e6:.2f}ms"
+        ]
+        lines += [f"{name:<14}{total / 1e3:8.1f}us"
+                  for name, total in self.phase_totals.items() if name != "frame"]
+        return "\n".join(lines)
+
+    def save_trace(self, path: Optional[str] = None) -> None:
+        """Write the recorded phases as Chrome trace JSON (chrome://tracing, Perfetto)"""
+        path = path or self.trace_path
+        if path is None:
+            return
+        origin = self._origin
+        trace = [
+            {"name": name, "cat": "game_loop", "ph": "X", "pid": self._pid, "tid": 0,
+             "ts": (start - origin) / 1000, "dur": (end - start) / 1000}
+            for name, start, end in self.events
+        ]
+        with open(path, 'w') as file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
+
+
+class StartupTimer:
+    """
+    Wall-clock time of each startup phase, up to the first rendered frame
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Initialize the timer
+
+        Args:
+            origin: time.perf_counter() value the first phase started at (default: now)
+        """
+        self._last = origin if origin is not None else time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str) -> None:
+        """End the current phase, naming it"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def report(self) -> str:
+        """One line per phase in milliseconds, then the total"""
+        lines = [f"{phase:<16}{seconds * 1000:8.1f}ms" for phase, seconds in self.phases]
+        lines.append(f"{'total':<16}{sum(seconds for _, seconds in self.phases) * 1000:8.1f}ms")
+        return "\n".join(lines)
@@ -0,0 +1,102 @@
+from typing import Callable, Dict, List, Sequence
+
+
+class Renderer:
+    """
+    Pushes the frame's sprite changes to the Tk canvas in one pass
+
+    screen.update() redraws every turtle on the screen. The renderer runs
+    after the physics ticks of a frame, asks each sprite to sync with its
+    simulation state, and redraws only the sprites that changed. Screen
+    tracing stays off, so goto() itself never draws.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.canvas = screen.getcanvas()
+        self.sprites: List = []  # Turtles with sync(alpha) -> bool
+        self._forced = set()
+
+    def add(self, *sprites) -> None:
+        """Register turtles that implement sync(alpha) -> bool"""
+        self.sprites.extend(sprites)
+
+    def invalidate(self, *sprites) -> None:
+        """Redraw sprites next frame even if their position did not change, e.g. after a color change"""
+        self._forced.update(sprites)
+
+    def render(self, alpha: float = 1.0) -> int:
+        """
+        Sync and redraw the sprites that changed, then flush the canvas once
+
+        Args:
+            alpha: Interpolation between the last two physics ticks
+
+        Returns:
+            Number of sprites redrawn
+        """
+        drawn = 0
+        forced = self._forced
+        screen = self.screen
+        # _drawturtle hides every turtle while tracing is off, so switch it on
+        # around the redraws exactly as screen.update() does
+        tracing = screen._tracing
+        screen._tracing = True
+        try:
+            for sprite in self.sprites:
+                if sprite.sync(alpha) or sprite in forced:
+                    # Turtle's own per-sprite redraw, as used by screen.update()
+                    sprite._update_data()
+                    sprite._drawturtle()
+                    drawn += 1
+        finally:
+            screen._tracing = tracing
+        forced.clear()
+        self.canvas.update_idletasks()
+        return drawn
+
+
+class SpritePool:
+    """
+    Fixed set of hidden sprites lent out to simulation states
+
+    Creating a turtle registers new canvas items and stalls the frame, so
+    every sprite is created up front and registered with the renderer once.
+    follow() shows a free sprite for each new state and hides the sprites
+    whose state is gone. States beyond the pool size are not drawn.
+    """
+
+    def __init__(self, renderer: Renderer, factory: Callable[[], object], size: int):
+        """
+        Create the sprites, hidden
+
+        Args:
+            renderer: Renderer that draws the sprites
+            factory: Creates one sprite with a state attribute and sync(alpha)
+            size: Number of sprites
+        """
+        self.renderer = renderer
+        self.sprites = [factory() for _ in range(size)]
+        for sprite in self.sprites:
+            sprite.hideturtle()
+        self.free = list(self.sprites)
+        self.bound: Dict[int, object] = {}  # id(state) -> sprite
+        renderer.add(*self.sprites)
+
+    def follow(self, states: Sequence) -> None:
+        """Bind a sprite to each state and release the sprites whose state is gone"""
+        if not states and not self.bound:
+            return
+        live = {id(state) for state in states}
+        for key in [key for key in self.bound if key not in live]:
+            sprite = self.bound.pop(key)
+            sprite.hideturtle()
+            self.free.append(sprite)
+            self.renderer.invalidate(sprite)
+        for state in states:
+            if id(state) not in self.bound and self.free:
+                sprite = self.free.pop()
+                sprite.state = state
+                sprite.showturtle()
+                self.bound[id(state)] = sprite
+                self.renderer.invalidate(sprite)
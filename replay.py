@@ -0,0 +1,138 @@
+from typing import Optional, Tuple
+from engine import Match
+import argparse
+import math
+import struct
+import zlib
+
+MAGIC = b"PNGR"
+VERSION = 2  # Version 1 files have no speed changes and still replay
+# magic, version, seed, dt (NaN for classic ticks), winning score, left/right paddle heights
+HEADER = struct.Struct("<4sHQdHdd")
+# tick count, left score, right score, ball x, ball y: checked after replaying
+TRAILER = struct.Struct("<QHHdd")
+# Input byte marking a ball speed change, followed by the new move_speed,
+# applied before the next tick; encode_input never produces it
+SPEED_CHANGE = 0xFF
+SPEED = struct.Struct("<d")
+
+
+def encode_input(l_direction: int, r_direction: int) -> int:
+    """Pack both paddle directions (-1, 0 or 1) into one byte"""
+    return (l_direction + 1) | (r_direction + 1) << 2
+
+
+def decode_input(code: int) -> Tuple[int, int]:
+    """Unpack a byte from encode_input into (left, right) directions"""
+    return (code & 0b11) - 1, (code >> 2 & 0b11) - 1
+
+
+def _final_state(match: Match) -> bytes:
+    return TRAILER.pack(
+        match.tick, match.score.l_score, match.score.r_score, match.ball.x, match.ball.y
+    )
+
+
+class InputRecorder:
+    """
+    Records one byte of paddle input per tick for a seeded Match
+
+    Ball speed changes made from outside the simulation go into the same
+    stream through record_speed, so the replay applies them at the same tick.
+    """
+
+    def __init__(self, match: Match, dt: Optional[float] = None):
+        """
+        Start recording a match from its current (freshly seeded) state
+
+        Args:
+            match: Match to record; call record() before each of its steps
+            dt: Tick length the match is stepped with (default: None)
+        """
+        self.match = match
+        self.dt = dt
+        self.restart()
+
+    def restart(self) -> None:
+        """Drop recorded input, e.g. after Match.reset"""
+        match = self.match
+        self.header = HEADER.pack(
+            MAGIC, VERSION, match.seed, math.nan if self.dt is None else self.dt,
+            match.score.winning_score, match.l_paddle.size[0], match.r_paddle.size[0]
+        )
+        self.inputs = bytearray()
+
+    def record(self) -> None:
+        """Store the paddle directions the next step will apply"""
+        self.inputs.append(encode_input(self.match.l_paddle.direction,
+                                        self.match.r_paddle.direction))
+
+    def record_speed(self, move_speed: float) -> None:
+        """Store a ball speed change made outside the simulation, e.g. by the speed slider"""
+        self.inputs.append(SPEED_CHANGE)
+        self.inputs += SPEED.pack(move_speed)
+
+    def save(self, path: str) -> None:
+        """Write the header, compressed input log and final-state trailer"""
+        with open(path, 'wb') as file:
+            file.write(self.header)
+            file.write(zlib.compress(bytes(self.inputs), 9))
+            file.write(_final_state(self.match))
+
+
+def load(path: str) -> Tuple[Match, Optional[float], bytes, bytes]:
+    """
+    Read a recording
+
+    Returns:
+        (match rebuilt from the header, dt, input stream, expected final state)
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, version, seed, dt, winning_score, l_height, r_height = HEADER.unpack_from(data)
+    if magic != MAGIC or version not in (1, VERSION):
+        raise ValueError(f"{path} is not a version {VERSION} Pong recording")
+    inputs = zlib.decompress(data[HEADER.size:-TRAILER.size])
+    match = Match(winning_score, seed)
+    match.l_paddle.size = (l_height, match.l_paddle.size[1])
+    match.r_paddle.size = (r_height, match.r_paddle.size[1])
+    return match, None if math.isnan(dt) else dt, inputs, data[-TRAILER.size:]
+
+
+def replay(path: str) -> Match:
+    """
+    Re-simulate a recording headlessly as fast as possible
+
+    Raises:
+        ValueError: If the replayed match does not end in the recorded state
+    """
+    match, dt, inputs, expected = load(path)
+    l_paddle, r_paddle = match.l_paddle, match.r_paddle
+    step = match.step
+    index, end = 0, len(inputs)
+    while index < end:
+        code = inputs[index]
+        index += 1
+        if code == SPEED_CHANGE:
+            match.ball.move_speed = SPEED.unpack_from(inputs, index)[0]
+            index += SPEED.size
+            continue
+        l_direction, r_direction = decode_input(code)
+        l_paddle.moving, l_paddle.direction = l_direction != 0, l_direction
+        r_paddle.moving, r_paddle.direction = r_direction != 0, r_direction
+        step(dt)
+    if _final_state(match) != expected:
+        raise ValueError(f"Replay of {path} diverged from the recorded match")
+    return match
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded Pong match without rendering")
+    parser.add_argument("recording", help="file written by InputRecorder.save")
+    args = parser.parse_args()
+    match = replay(args.recording)
+    print(f"Replayed {match.tick} ticks: {match.score.l_score} - {match.score.r_score}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+from typing import List, Optional, Tuple
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+SCORE_DB_FILE = "pong_scores.db"
+LEGACY_HIGH_SCORE_FILE = "pong_scores.json"
+BATCH_SIZE = 512  # Most results written in one transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    l_score INTEGER NOT NULL,
+    r_score INTEGER NOT NULL,
+    best INTEGER NOT NULL,
+    winner TEXT,
+    winning_score INTEGER,
+    seed INTEGER,
+    ticks INTEGER
+);
+CREATE INDEX IF NOT EXISTS matches_by_best ON matches (best DESC, finished_at);
+CREATE INDEX IF NOT EXISTS matches_by_time ON matches (finished_at DESC);
+"""
+
+MatchRow = Tuple[float, int, int, int, Optional[str], Optional[int], Optional[int], Optional[int]]
+
+
+class ScoreStore:
+    """
+    SQLite store of match results and high scores
+
+    Results are queued and written by a background thread in batched
+    transactions, so recording one never blocks the game loop. The database
+    runs in WAL mode, so a crash loses at most the unwritten queue and never
+    leaves a half-written result.
+    """
+
+    def __init__(self, path: str = SCORE_DB_FILE):
+        """
+        Open (or create) the store and start its writer thread
+
+        Args:
+            path: SQLite database file (default: pong_scores.db)
+        """
+        self.path = path
+        self._queue: "queue.Queue[Optional[MatchRow]]" = queue.Queue()
+        self._reader = self._connect()
+        with self._reader:
+            self._reader.executescript(SCHEMA)
+        self._import_legacy_high_score()
+        self._writer = threading.Thread(target=self._write_loop, name="score-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _import_legacy_high_score(self) -> None:
+        """Carry over the single high score kept by older versions"""
+        if self._reader.execute("SELECT 1 FROM matches LIMIT 1").fetchone():
+            return
+        try:
+            with open(LEGACY_HIGH_SCORE_FILE, 'r') as file:
+                high_score = int(json.load(file).get('high_score', 0))
+        except (FileNotFoundError, ValueError):
+            return
+        if high_score > 0:
+            with self._reader:
+                self._reader.execute(
+                    "INSERT INTO matches (finished_at, l_score, r_score, best) VALUES (?, 0, 0, ?)",
+                    (os.path.getmtime(LEGACY_HIGH_SCORE_FILE), high_score)
+                )
+
+    def record_match(
+            self,
+            l_score: int,
+            r_score: int,
+            winner: Optional[str] = None,
+            winning_score: Optional[int] = None,
+            seed: Optional[int] = None,
+            ticks: Optional[int] = None
+    ) -> None:
+        """Queue a finished match for writing; returns immediately"""
+        self._queue.put((time.time(), l_score, r_score, max(l_score, r_score),
+                         winner, winning_score, seed, ticks))
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        while True:
+            row = self._queue.get()
+            batch: List[MatchRow] = []
+            stop = row is None
+            if not stop:
+                batch.append(row)
+            while not stop and len(batch) < BATCH_SIZE:
+                try:
+                    row = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if row is None:
+                    stop = True
+                else:
+                    batch.append(row)
+            if batch:
+                with connection:  # One atomic transaction per batch
+                    connection.executemany(
+                        "INSERT INTO matches (finished_at, l_score, r_score, best, winner,"
+                        " winning_score, seed, ticks) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        batch
+                    )
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                connection.close()
+                return
+
+    def flush(self) -> None:
+        """Block until every queued result has been written"""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._reader.close()
+
+    def high_score(self) -> int:
+        """Best single-side score ever recorded"""
+        row = self._reader.execute("SELECT MAX(best) FROM matches").fetchone()
+        return row[0] or 0
+
+    def leaderboard(self, limit: int = 10) -> List[Tuple[int, str, float]]:
+        """Top results as (best score, winner, finished_at), best first"""
+        return self._reader.execute(
+            "SELECT best, winner, finished_at FROM matches ORDER BY best DESC, finished_at LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+    def recent_matches(self, limit: int = 10) -> List[Tuple[float, int, int, Optional[str]]]:
+        """Most recent results as (finished_at, l_score, r_score, winner)"""
+        return self._reader.execute(
+            "SELECT finished_at, l_score, r_score, winner FROM matches"
+            " ORDER BY finished_at DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+
+    def match_count(self) -> int:
+        return self._reader.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
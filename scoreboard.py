@@ -1,97 +1,169 @@
 from turtle import Turtle
-from typing import Tuple
-import json
+from typing import Tuple, Optional
+from engine import Match, ScoreState
+from score_store import ScoreStore
 
 FONT = ("Courier", 40, "bold")
 SMALL_FONT = ("Courier", 16, "normal")
 ALIGNMENT = "center"
-HIGH_SCORE_FILE = "pong_scores.json"
+ANCHORS = {"left": "sw", "center": "s", "right": "se"}  # As used by Turtle.write
+# Text fields drawn as persistent canvas items: field -> ((x, y), font)
+TEXT_FIELDS = {
+    "l_score": ((-100, 240), FONT),
+    "r_score": ((100, 240), FONT),
+    "high_score": ((0, 260), SMALL_FONT),
+    "banner": ((0, 0), FONT),
+}
 
 
 class Scoreboard(Turtle):
-    def __init__(self):
+    def __init__(
+            self,
+            state: Optional[ScoreState] = None,
+            store: Optional[ScoreStore] = None,
+            match: Optional[Match] = None
+    ):
+        """
+        Initialize the scoreboard
+
+        Args:
+            state: Score state to display (default: match.score, or a new ScoreState)
+            store: Where finished matches and the high score are kept
+                (default: none, so nothing is saved)
+            match: Match whose seed and tick count are stored with each result
+        """
         super().__init__()
         self.color("white")
         self.penup()
         self.hideturtle()
-        self.l_score = 0
-        self.r_score = 0
-        self.winning_score = 11
-        self.game_active = True
-        self.high_score = self._load_high_score()
+        self._setup_text_items("white")
+        self.state = state or (match.score if match is not None else ScoreState())
+        self.store = store
+        self.match = match
+        if store is not None:
+            self.state.high_score = store.high_score()
+        self._result_recorded = False
         self.update_scoreboard()
 
+    @property
+    def l_score(self) -> int:
+        return self.state.l_score
+
+    @property
+    def r_score(self) -> int:
+        return self.state.r_score
+
+    @property
+    def winning_score(self) -> int:
+        return self.state.winning_score
+
+    @property
+    def game_active(self) -> bool:
+        return self.state.game_active
+
+    @property
+    def high_score(self) -> int:
+        return self.state.high_score
+
+    def attach_store(self, store: ScoreStore) -> None:
+        """Save finished matches to a store opened after the scoreboard, and show its high score"""
+        self.store = store
+        self.state.high_score = max(self.state.high_score, store.high_score())
+        self.update_scoreboard()
+
+    def _setup_text_items(self, color: str) -> None:
+        """
+        Create one empty canvas text item per field
+
+        The items are reconfigured in place for the rest of the game instead
+        of being cleared and rewritten, so scoring a point touches only the
+        fields whose text changed.
+        """
+        screen = self.getscreen()
+        self._canvas = screen.getcanvas()
+        self._items = {}
+        self._texts = {}
+        for field, ((x, y), font) in TEXT_FIELDS.items():
+            # Same placement as Turtle.write
+            self._items[field] = self._canvas.create_text(
+                x * screen.xscale - 1, -y * screen.yscale, text="", anchor=ANCHORS[ALIGNMENT],
+                fill=color, font=font
+            )
+            self._texts[field] = ""
+
+    def _set_text(self, field: str, text: str) -> None:
+        """Reconfigure a field's canvas item only if its text changed"""
+        if self._texts[field] != text:
+            self._canvas.itemconfigure(self._items[field], text=text)
+            self._texts[field] = text
+
     def update_scoreboard(self) -> None:
-        self.clear()
         # Main scores at the top
-        self.goto(-100, 240)
-        self.write(self.l_score, align=ALIGNMENT, font=FONT)
-        self.goto(100, 240)
-        self.write(self.r_score, align=ALIGNMENT, font=FONT)
+        self._set_text("l_score", str(self.state.l_score))
+        self._set_text("r_score", str(self.state.r_score))
 
         # Small high score display
-        self.goto(0, 260)
-        self.write(f"Best: {self.high_score}", align=ALIGNMENT, font=SMALL_FONT)
+        self._set_text("high_score", f"Best: {self.state.high_score}")
+
+        if self.state.game_active:
+            self._set_text("banner", "")
+
+    def set_color(self, color: str) -> None:
+        """Set the color of every scoreboard field"""
+        self.color(color)
+        for item in self._items.values():
+            self._canvas.itemconfigure(item, fill=color)
 
     def l_point(self) -> None:
-        self.l_score += 1
-        self._check_winner()
-        self.update_scoreboard()
+        self.state.l_point()
+        self.refresh()
 
     def r_point(self) -> None:
-        self.r_score += 1
+        self.state.r_point()
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Redraw after the simulation state awarded a point"""
         self._check_winner()
         self.update_scoreboard()
 
     def _check_winner(self) -> None:
         """Check for winner and update high score if needed"""
-        if max(self.l_score, self.r_score) >= self.winning_score:
-            self.game_active = False
-            # Update high score if needed
-            current_max = max(self.l_score, self.r_score)
-            if current_max > self.high_score:
-                self.high_score = current_max
-                self._save_high_score()
+        winner = self.state.check_winner()
+        if winner is not None:
+            if not self._result_recorded:
+                self._record_result(winner)
             # Display winner message
-            winner = "LEFT" if self.l_score > self.r_score else "RIGHT"
             self.show_winner_message(winner)
 
     def show_winner_message(self, winner: str) -> None:
-        """Briefly show winner message"""
-        self.goto(0, 0)
-        self.write(f"{winner} WINS!", align=ALIGNMENT, font=FONT)
+        """Show winner message until the scores are reset"""
+        self._set_text("banner", f"{winner} WINS!")
 
     def reset_scores(self) -> None:
         """Reset game state"""
-        self.l_score = 0
-        self.r_score = 0
-        self.game_active = True
-        self.clear()
+        self.state.reset_scores()
+        self._result_recorded = False
         self.update_scoreboard()
 
-    def _load_high_score(self) -> int:
-        """Load high score from file"""
-        try:
-            with open(HIGH_SCORE_FILE, 'r') as file:
-                data = json.load(file)
-                return data.get('high_score', 0)
-        except FileNotFoundError:
-            return 0
-
-    def _save_high_score(self) -> None:
-        """Save high score to file"""
-        with open(HIGH_SCORE_FILE, 'w') as file:
-            json.dump({'high_score': self.high_score}, file)
+    def _record_result(self, winner: str) -> None:
+        """Queue the finished match for the score store's background writer"""
+        if self.store is not None:
+            match = self.match
+            self.store.record_match(self.state.l_score, self.state.r_score, winner,
+                                    self.state.winning_score,
+                                    match.seed if match is not None else None,
+                                    match.tick if match is not None else None)
+        self._result_recorded = True
 
     def get_score(self) -> Tuple[int, int]:
         """Return current scores"""
-        return self.l_score, self.r_score
+        return self.state.get_score()
 
     def is_game_active(self) -> bool:
         """Check if game is still active"""
-        return self.game_active
+        return self.state.game_active
 
     def set_winning_score(self, score: int) -> None:
         """Set custom winning score"""
-        if score > 0:
-            self.winning_score = score
\ No newline at end of file
+        self.state.set_winning_score(score)
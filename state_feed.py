@@ -0,0 +1,254 @@
+from typing import List, NamedTuple, Optional
+from multiprocessing import resource_tracker, shared_memory
+from engine import Match
+import argparse
+import os
+import struct
+import time
+
+DEFAULT_NAME = "pong_state"
+DEFAULT_SLOTS = 256  # Ticks kept; a reader more than this far behind skips ahead
+MAGIC = b"PNGS"
+VERSION = 2
+
+# magic, version, slot count, record size, writer process id, writer token,
+# latest sequence (0 = nothing yet)
+HEADER = struct.Struct("<4sHHHxxIIQ")
+OWNER_OFFSET = 12
+# slot sequence, tick, ball x, y, x_move, y_move, left paddle y, right paddle y,
+# left score, right score, game active
+RECORD = struct.Struct("<QQddddddIIB7x")
+SEQ = struct.Struct("<Q")
+LATEST_OFFSET = HEADER.size - SEQ.size
+OWNER = struct.Struct("<II")  # Writer process id and a random token, unique per feed
+_published = set()  # Names of the feeds this process has open
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing block without this process unlinking it at exit"""
+    if name in _published:  # Already tracked by our own StateFeed; leave that as it is
+        return shared_memory.SharedMemory(name)
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:  # Python before 3.13 always tracks, and unlinks at exit
+        shm = shared_memory.SharedMemory(name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _writer_alive(pid: int) -> bool:
+    """Whether the process that wrote a feed header is still running"""
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # Running, as another user
+        return True
+    return True
+
+
+class FeedRecord(NamedTuple):
+    seq: int
+    tick: int
+    ball_x: float
+    ball_y: float
+    x_move: float
+    y_move: float
+    l_y: float
+    r_y: float
+    l_score: int
+    r_score: int
+    game_active: bool
+
+
+class StateFeed:
+    """
+    Publishes match state into a shared memory ring buffer, one record per tick
+
+    The block starts with a header holding the latest sequence number,
+    followed by a fixed number of fixed-size slots. Record n goes to slot
+    n % slots. The writer zeroes a slot's sequence before filling it and
+    sets it last, so a reader that sees the same sequence before and after
+    copying a slot knows it got a whole record. Publishing never waits for
+    readers, and readers never write.
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME, slots: int = DEFAULT_SLOTS):
+        """
+        Create the shared memory block
+
+        Args:
+            name: Shared memory name readers attach to (default: pong_state)
+            slots: Records kept in the ring (default: 256)
+
+        Raises:
+            FileExistsError: If another running game publishes under this
+                name, or the name belongs to something else
+        """
+        self.slots = slots
+        size = HEADER.size + slots * RECORD.size
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            self._unlink_stale(name)
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        self.buf = self.shm.buf
+        self.owner = (os.getpid(), int.from_bytes(os.urandom(4), "little"))
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, slots, RECORD.size, *self.owner, 0)
+        _published.add(self.shm.name)
+        self.seq = 0
+
+    @staticmethod
+    def _unlink_stale(name: str) -> None:
+        """
+        Remove a feed block left behind by a game that exited without closing it
+
+        The block is only stale if the process id in its header is gone;
+        version 1 blocks carry none and are always replaced. Readers still
+        attached to the old block keep their mapping, but see no new records.
+
+        Raises:
+            FileExistsError: If the block is live or not a state feed
+        """
+        if name in _published:
+            raise FileExistsError(f"This process already publishes a state feed named {name}")
+        old = _attach(name)
+        try:
+            magic, version = struct.unpack_from("<4sH", old.buf, 0)
+            pid = OWNER.unpack_from(old.buf, OWNER_OFFSET)[0] if version >= 2 else None
+        finally:
+            old.close()
+        if magic != MAGIC:
+            raise FileExistsError(f"Shared memory {name} exists and is not a Pong state feed")
+        if pid is not None and _writer_alive(pid):
+            raise FileExistsError(f"Process {pid} is already publishing a state feed named {name};"
+                                  f" choose another name with --feed NAME")
+        resource_tracker.register(old._name, "shared_memory")  # unlink() unregisters it again
+        old.unlink()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def publish(self, match: Match) -> None:
+        """Write the match's current state as the next record"""
+        self.seq += 1
+        seq, buf = self.seq, self.buf
+        offset = HEADER.size + (seq % self.slots) * RECORD.size
+        ball, score = match.ball, match.score
+        SEQ.pack_into(buf, offset, 0)  # Mark the slot as being written
+        RECORD.pack_into(buf, offset, 0, match.tick, ball.x, ball.y, ball.x_move, ball.y_move,
+                         match.l_paddle.y, match.r_paddle.y, score.l_score, score.r_score,
+                         score.game_active)
+        SEQ.pack_into(buf, offset, seq)
+        SEQ.pack_into(buf, LATEST_OFFSET, seq)
+
+    def _owns_name(self) -> bool:
+        """Whether the block under this feed's name is still the one this feed created"""
+        try:
+            current = _attach(self.shm.name)
+        except FileNotFoundError:
+            return False
+        try:
+            return OWNER.unpack_from(current.buf, OWNER_OFFSET) == self.owner
+        finally:
+            current.close()
+
+    def close(self) -> None:
+        """Release the shared memory block, and remove it unless another feed replaced it"""
+        self.buf = None
+        self.shm.close()
+        owned = self._owns_name()
+        _published.discard(self.shm.name)
+        if owned:
+            self.shm.unlink()
+        else:
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+
+
+class StateFeedReader:
+    """
+    Reads records from a StateFeed in another process without copying the block
+    """
+
+    def __init__(self, name: str = DEFAULT_NAME):
+        """
+        Attach to a feed
+
+        Args:
+            name: Shared memory name of the feed (default: pong_state)
+
+        Raises:
+            FileNotFoundError: If no feed of that name exists
+            ValueError: If the block is not a state feed of this version
+        """
+        self.shm = _attach(name)
+        self.buf = self.shm.buf
+        magic, version, self.slots, record_size, _, _, _ = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{name} is not a version {VERSION} Pong state feed")
+        self.last_seq = 0
+
+    def latest_seq(self) -> int:
+        return SEQ.unpack_from(self.buf, LATEST_OFFSET)[0]
+
+    def read(self, seq: int) -> Optional[FeedRecord]:
+        """The record with this sequence number, or None if it was overwritten or torn"""
+        offset = HEADER.size + (seq % self.slots) * RECORD.size
+        fields = RECORD.unpack_from(self.buf, offset)
+        if fields[0] != seq or SEQ.unpack_from(self.buf, offset)[0] != seq:
+            return None
+        return FeedRecord(*fields[:-1], bool(fields[-1]))
+
+    def latest(self) -> Optional[FeedRecord]:
+        """The newest record, or None before the first one"""
+        seq = self.latest_seq()
+        while seq:
+            record = self.read(seq)
+            if record is not None:
+                self.last_seq = max(self.last_seq, seq)
+                return record
+            seq -= 1  # Overwritten while reading; fall back to the one before
+        return None
+
+    def read_new(self) -> List[FeedRecord]:
+        """Records published since the last call, skipping any already overwritten"""
+        latest = self.latest_seq()
+        first = max(self.last_seq + 1, latest - self.slots + 2)
+        records = [record for record in map(self.read, range(first, latest + 1))
+                   if record is not None]
+        self.last_seq = max(self.last_seq, latest)
+        return records
+
+    def close(self) -> None:
+        self.buf = None
+        self.shm.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print a running game's state feed")
+    parser.add_argument("name", nargs="?", default=DEFAULT_NAME, help="feed name")
+    parser.add_argument("--hz", type=float, default=10.0, help="lines printed per second")
+    args = parser.parse_args()
+
+    reader = StateFeedReader(args.name)
+    try:
+        while True:
+            records = reader.read_new()
+            if records:
+                record = records[-1]
+                print(f"tick {record.tick:>8}  ball ({record.ball_x:7.1f}, {record.ball_y:7.1f})"
+                      f"  paddles {record.l_y:6.1f} {record.r_y:6.1f}"
+                      f"  score {record.l_score}-{record.r_score}  ({len(records)} new)")
+            time.sleep(1 / args.hz)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+from typing import Dict, List, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from engine import BallState, Match, PaddleState
+from controllers import CPUController, PaddleController
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+
+DT = 1 / 120
+MAX_MATCH_MINUTES = 10  # Default simulated time after which a match counts as unfinished
+CHUNK_SIZE = 50  # Matches per worker task
+PADDLE_ZONE = Match.R_PADDLE_POSITION[0] - 40  # |x| beyond which a reversal is a paddle hit
+
+# Sweepable parameters and the type of their values
+PARAMETERS = {
+    "speed_decay": float,
+    "min_speed": float,
+    "bounce_spread": float,
+    "initial_speed": float,
+    "paddle_height": float,
+    "left": str,
+    "right": str,
+}
+DEFAULTS = {
+    "speed_decay": BallState.SPEED_DECAY,
+    "min_speed": BallState.MIN_SPEED,
+    "bounce_spread": BallState.BOUNCE_SPREAD,
+    "initial_speed": BallState.DEFAULT_SPEED,
+    "paddle_height": PaddleState.DEFAULT_SIZE[0],
+    "left": "cpu:easy",  # Evenly matched CPUs rarely score, and their matches hit max_minutes
+    "right": "tracker",
+}
+
+
+class TrackingController(PaddleController):
+    """
+    Scripted player that follows the ball's height every tick
+    """
+
+    DEAD_ZONE = 4
+
+    def control(self, match: Match) -> None:
+        self.move_towards(match.ball.y, self.DEAD_ZONE)
+
+
+def make_player(spec: str, paddle: PaddleState, match: Match) -> PaddleController:
+    """
+    Build a player from a spec
+
+    Args:
+        spec: "cpu:<level>" for a CPUController, or "tracker"
+        paddle: Paddle the player drives
+        match: Match whose generator the CPU uses for aiming errors
+
+    Returns:
+        The controller
+    """
+    kind, _, level = spec.partition(":")
+    if kind == "cpu":
+        return CPUController(paddle, level or "default", rng=match.rng, budget_us=10 ** 6)
+    if kind == "tracker":
+        return TrackingController(paddle, budget_us=10 ** 6)
+    raise ValueError(f"Unknown player: {spec}")
+
+
+def _apply(match: Match, params: dict) -> None:
+    ball = match.ball
+    ball.speed_decay = params["speed_decay"]
+    ball.min_speed = params["min_speed"]
+    ball.bounce_spread = params["bounce_spread"]
+    ball.initial_speed = ball.move_speed = params["initial_speed"]
+    for paddle in (match.l_paddle, match.r_paddle):
+        paddle.size = (params["paddle_height"], paddle.size[1])
+
+
+def simulate(
+        params: dict,
+        seeds: List[int],
+        winning_score: int,
+        max_minutes: float = MAX_MATCH_MINUTES
+) -> dict:
+    """
+    Worker side: play one match per seed with the given parameters
+
+    Returns:
+        Win counts, points, simulated seconds and a histogram of rally lengths
+        (paddle hits before each point)
+    """
+    max_ticks = int(max_minutes * 60 / DT)
+    rallies: Counter = Counter()
+    result = {"matches": 0, "left_wins": 0, "right_wins": 0, "unfinished": 0,
+              "points": 0, "seconds": 0.0}
+    for seed in seeds:
+        match = Match(winning_score, seed)
+        _apply(match, params)
+        players = (make_player(params["left"], match.l_paddle, match),
+                   make_player(params["right"], match.r_paddle, match))
+        ball = match.ball
+        hits = 0
+        while match.score.game_active and match.tick < max_ticks:
+            for player in players:
+                player.tick(match)
+            heading_right = ball.x_move > 0
+            if match.step(DT) is not None:
+                rallies[hits] += 1
+                result["points"] += 1
+                hits = 0
+            elif (ball.x_move > 0) != heading_right and abs(ball.x) > PADDLE_ZONE:
+                hits += 1  # A turn near a paddle, not a wall bounce tipping past vertical
+        result["matches"] += 1
+        result["seconds"] += match.tick * DT
+        winner = match.score.winner()
+        if winner == "LEFT":
+            result["left_wins"] += 1
+        elif winner == "RIGHT":
+            result["right_wins"] += 1
+        else:
+            result["unfinished"] += 1
+    result["rallies"] = rallies
+    return result
+
+
+def _percentile(histogram: Counter, fraction: float) -> int:
+    total = sum(histogram.values())
+    seen = 0
+    for length in sorted(histogram):
+        seen += histogram[length]
+        if seen >= total * fraction:
+            return length
+    return 0
+
+
+def summarize(params: dict, totals: dict) -> dict:
+    """One report row: the parameters, then the measured balance figures"""
+    rallies = totals["rallies"]
+    matches = totals["matches"] or 1
+    points = sum(rallies.values())
+    minutes = totals["seconds"] / 60
+    return {
+        **params,
+        "matches": totals["matches"],
+        "left_win_rate": round(totals["left_wins"] / matches, 4),
+        "right_win_rate": round(totals["right_wins"] / matches, 4),
+        "unfinished": totals["unfinished"],
+        "points_per_minute": round(totals["points"] / minutes, 3) if minutes else None,
+        "mean_match_minutes": round(minutes / matches, 3),
+        "rally_mean": round(sum(length * count for length, count in rallies.items()) / points, 3)
+        if points else None,
+        "rally_p50": _percentile(rallies, 0.5),
+        "rally_p90": _percentile(rallies, 0.9),
+        "rally_max": max(rallies, default=0),
+    }
+
+
+def sweep(
+        grid: Dict[str, list],
+        matches: int,
+        winning_score: int = 5,
+        seed: int = 0,
+        workers: Optional[int] = None,
+        max_minutes: float = MAX_MATCH_MINUTES
+) -> List[Tuple[dict, dict]]:
+    """
+    Play matches for every combination of the grid across worker processes
+
+    Every combination uses the same seeds, so differences between rows come
+    from the parameters rather than from luck.
+
+    Args:
+        grid: Values to try per parameter; missing parameters keep DEFAULTS
+        matches: Matches per combination
+        winning_score: Points needed to win each match (default: 5, as in the game)
+        seed: Seed of the first match; match n uses seed + n (default: 0)
+        workers: Worker processes (default: one per CPU core)
+        max_minutes: Simulated minutes before a match is cut off as unfinished (default: 10)
+
+    Returns:
+        (report row, rally histogram) per combination
+    """
+    names = list(grid)
+    combos = [{**DEFAULTS, **dict(zip(names, values))}
+              for values in itertools.product(*(grid[name] for name in names))]
+    seeds = list(range(seed, seed + matches))
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, matches, CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [[pool.submit(simulate, combo, chunk, winning_score, max_minutes) for chunk in chunks]
+                   for combo in combos]
+        results = []
+        for combo, parts in zip(combos, futures):
+            totals = {"matches": 0, "left_wins": 0, "right_wins": 0, "unfinished": 0,
+                      "points": 0, "seconds": 0.0, "rallies": Counter()}
+            for part in parts:
+                part = part.result()
+                for key in totals:
+                    totals[key] += part[key]
+            results.append((summarize(combo, totals), totals["rallies"]))
+    return results
+
+
+def parse_param(text: str) -> Tuple[str, list]:
+    """Parse name=value,value,... into a parameter name and its values"""
+    name, _, values = text.partition("=")
+    if name not in PARAMETERS or not values:
+        raise argparse.ArgumentTypeError(
+            f"expected name=v1,v2,... with name one of {', '.join(PARAMETERS)}")
+    return name, [PARAMETERS[name](value) for value in values.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sweep Pong balance parameters over simulated matches")
+    parser.add_argument("--param", type=parse_param, action="append", default=[],
+                        metavar="NAME=V1,V2", help=f"values to try; one of {', '.join(PARAMETERS)}")
+    parser.add_argument("--matches", type=int, default=1000, help="matches per combination")
+    parser.add_argument("--winning-score", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-minutes", type=float, default=MAX_MATCH_MINUTES,
+                        help="simulated minutes before a match counts as unfinished")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--csv", metavar="PATH", help="write one row per combination")
+    parser.add_argument("--json", metavar="PATH", help="write rows and rally histograms")
+    args = parser.parse_args()
+
+    grid = dict(args.param)
+    start = time.perf_counter()
+    results = sweep(grid, args.matches, args.winning_score, args.seed, args.workers,
+                    args.max_minutes)
+    elapsed = time.perf_counter() - start
+    for row, _ in results:
+        print(row)
+    print(f"{len(results) * args.matches} matches in {elapsed:.1f}s on "
+          f"{args.workers or os.cpu_count()} workers")
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0][0]))
+            writer.writeheader()
+            writer.writerows(row for row, _ in results)
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump([{**row, "rally_histogram": {str(length): count
+                                                   for length, count in sorted(rallies.items())}}
+                       for row, rallies in results], file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
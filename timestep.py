@@ -0,0 +1,64 @@
+from typing import Optional
+
+
+class FixedTimestep:
+    """
+    Accumulator that converts variable frame times into fixed physics ticks
+    """
+
+    DEFAULT_HZ = 120
+    MAX_STEPS_PER_FRAME = 8  # Drop time instead of spiralling when a frame stalls
+
+    def __init__(self, hz: float = DEFAULT_HZ, max_steps: int = MAX_STEPS_PER_FRAME):
+        """
+        Initialize a new fixed timestep clock
+
+        Args:
+            hz: Physics ticks per second (default: 120)
+            max_steps: Most ticks a single frame may run (default: 8)
+        """
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.last_time: Optional[float] = None
+        self.set_rate(hz)
+
+    def set_rate(self, hz: float) -> None:
+        """Change the physics tick rate"""
+        if hz <= 0:
+            raise ValueError("Tick rate must be positive")
+        self.hz = hz
+        self.dt = 1.0 / hz
+
+    def reset(self, now: Optional[float] = None) -> None:
+        """Forget accumulated time, e.g. after a pause"""
+        self.accumulator = 0.0
+        self.last_time = now
+
+    def advance(self, now: float) -> int:
+        """
+        Add the time elapsed since the previous call
+
+        Args:
+            now: Current time in seconds from a monotonic clock
+
+        Returns:
+            Number of fixed ticks that are due this frame
+        """
+        if self.last_time is None:
+            self.last_time = now
+            return 0
+        self.accumulator += now - self.last_time
+        self.last_time = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a tick left in the accumulator, for render interpolation"""
+        return self.accumulator / self.dt
@@ -0,0 +1,110 @@
+from typing import List, Tuple, Union
+
+Color = Union[str, Tuple[float, float, float]]
+
+
+class Trail:
+    """
+    Fixed-length ball trail drawn with a constant set of canvas line items
+
+    Recent positions live in a preallocated ring buffer. Each push moves the
+    existing segments instead of drawing new lines, so the canvas item
+    count and memory stay flat however long a rally lasts. Segment colors
+    are fixed by age and optionally fade into the background.
+    """
+
+    DEFAULT_LENGTH = 24
+    DEFAULT_WIDTH = 3
+
+    def __init__(
+            self,
+            screen,
+            color: Color = "white",
+            length: int = DEFAULT_LENGTH,
+            width: int = DEFAULT_WIDTH,
+            fade: bool = True
+    ):
+        """
+        Create the trail's canvas items, hidden
+
+        Args:
+            screen: Turtle screen to draw on
+            color: Color of the newest segment (default: white)
+            length: Number of positions remembered (default: 24)
+            width: Line width in pixels (default: 3)
+            fade: Blend older segments into the background (default: True)
+        """
+        if length < 2:
+            raise ValueError("A trail needs at least two positions")
+        self.screen = screen
+        self.canvas = screen.getcanvas()
+        self.length = length
+        self.fade = fade
+        self._xs = [0.0] * length
+        self._ys = [0.0] * length
+        self._head = -1  # Index of the newest position
+        self._count = 0
+        self._visible = 0  # Segments currently shown
+        self._items: List[int] = [
+            self.canvas.create_line(0, 0, 0, 0, width=width, capstyle="round", state="hidden")
+            for _ in range(length - 1)
+        ]
+        self.color = color
+        self.background = screen.bgcolor()
+        self._apply_colors()
+
+    def _rgb(self, color: Color) -> Tuple[int, int, int]:
+        """8-bit RGB for a Tk color name, hex string or turtle color tuple"""
+        if isinstance(color, str):
+            return tuple(channel // 256 for channel in self.canvas.winfo_rgb(color))
+        scale = 255 / self.screen.colormode()
+        return tuple(int(channel * scale) for channel in color)
+
+    def _apply_colors(self) -> None:
+        start = self._rgb(self.color)
+        end = self._rgb(self.background)
+        segments = len(self._items)
+        for age, item in enumerate(self._items):
+            blend = age / segments if self.fade else 0.0
+            rgb = (int(a + (b - a) * blend) for a, b in zip(start, end))
+            self.canvas.itemconfigure(item, fill="#%02x%02x%02x" % tuple(rgb))
+
+    def set_color(self, color: Color) -> None:
+        """Change the color of the newest segment"""
+        self.color = color
+        self._apply_colors()
+
+    def set_background(self, background: Color) -> None:
+        """Change the color older segments fade into"""
+        self.background = background
+        self._apply_colors()
+
+    def push(self, x: float, y: float) -> None:
+        """Add the ball's latest position and move the segments to follow it"""
+        length = self.length
+        head = self._head = (self._head + 1) % length
+        self._xs[head] = x
+        self._ys[head] = y
+        if self._count < length:
+            self._count += 1
+
+        xs, ys = self._xs, self._ys
+        xscale, yscale = self.screen.xscale, self.screen.yscale
+        coords = self.canvas.coords
+        segments = self._count - 1
+        for age in range(segments):
+            newer = (head - age) % length
+            older = newer - 1 if newer else length - 1
+            coords(self._items[age], xs[newer] * xscale, -ys[newer] * yscale,
+                   xs[older] * xscale, -ys[older] * yscale)
+        for age in range(self._visible, segments):
+            self.canvas.itemconfigure(self._items[age], state="normal")
+        self._visible = segments
+
+    def clear(self) -> None:
+        """Forget all positions and hide every segment"""
+        for item in self._items[:self._visible]:
+            self.canvas.itemconfigure(item, state="hidden")
+        self._visible = 0
+        self._count = 0
+        self._head = -1
@@ -0,0 +1,58 @@
+from typing import Tuple, Optional
+
+
+def fold(value: float, lower: float, upper: float) -> float:
+    """
+    Reflect a coordinate back between two walls
+
+    Unfolding the walls turns a bouncing path into a straight line, so the
+    real position is the straight-line position folded with period
+    2 * (upper - lower).
+    """
+    span = upper - lower
+    offset = (value - lower) % (2 * span)
+    return lower + (offset if offset <= span else 2 * span - offset)
+
+
+def position_after(
+        x: float,
+        y: float,
+        dx: float,
+        dy: float,
+        steps: float,
+        lower: float,
+        upper: float
+) -> Tuple[float, float]:
+    """Position after a number of moves, reflecting off the walls at lower and upper"""
+    return x + dx * steps, fold(y + dy * steps, lower, upper)
+
+
+def intercept_y(
+        x: float,
+        y: float,
+        dx: float,
+        dy: float,
+        target_x: float,
+        lower: float,
+        upper: float
+) -> Optional[Tuple[float, float]]:
+    """
+    Where a ball will cross a vertical line, with ideal wall reflections
+
+    Args:
+        x: Current ball x
+        y: Current ball y
+        dx: x movement per step
+        dy: y movement per step
+        target_x: x of the line, e.g. a paddle face
+        lower: y of the lower wall
+        upper: y of the upper wall
+
+    Returns:
+        (y at the crossing, steps until the crossing), or None if the ball
+        is not moving towards target_x
+    """
+    if dx == 0 or (target_x - x) * dx < 0:
+        return None
+    steps = (target_x - x) / dx
+    return fold(y + dy * steps, lower, upper), steps